@@ -0,0 +1 @@
+"""Benchmarks for the Jet2 integration."""
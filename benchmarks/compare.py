@@ -0,0 +1,86 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/BASE.json benchmarks/results/HEAD.json
+
+Every metric is lower-is-better. Exits non-zero when a metric got worse by
+more than the threshold, so it can gate a CI job.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+# Changes below these are noise, whatever the percentage.
+ABSOLUTE_NOISE = {
+    "_s": 0.05,
+    "_ms": 5.0,
+    "_mib": 1.0,
+    "_kib": 16.0,
+}
+
+
+def _is_noise(metric: str, base: float, head: float) -> bool:
+    """Return True if a change is too small to mean anything."""
+    for suffix, noise in ABSOLUTE_NOISE.items():
+        if metric.endswith(suffix):
+            return abs(head - base) < noise
+    return False
+
+
+def compare(base: dict, head: dict, threshold: float) -> tuple[list[str], bool]:
+    """Return report lines and whether anything regressed."""
+    lines = [f"{'benchmark / metric':60} {'base':>12} {'head':>12} {'change':>9}"]
+    regressed = False
+
+    for name in sorted(base["benchmarks"].keys() | head["benchmarks"].keys()):
+        base_metrics = base["benchmarks"].get(name, {})
+        head_metrics = head["benchmarks"].get(name, {})
+        lines.append(name)
+        for metric in sorted(base_metrics.keys() | head_metrics.keys()):
+            old = base_metrics.get(metric)
+            new = head_metrics.get(metric)
+            if old is None or new is None:
+                change = "n/a"
+                flag = ""
+            else:
+                delta = (
+                    (new - old) / old * 100 if old else (0.0 if new == old else 100.0)
+                )
+                change = f"{delta:+.1f}%"
+                flag = ""
+                if delta > threshold and not _is_noise(metric, old, new):
+                    flag = "  REGRESSED"
+                    regressed = True
+            lines.append(
+                f"  {metric:58} {old if old is not None else '-':>12} "
+                f"{new if new is not None else '-':>12} {change:>9}{flag}"
+            )
+
+    return lines, regressed
+
+
+def main() -> int:
+    """Run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Percent worse to fail on"
+    )
+    args = parser.parse_args()
+
+    base = json.loads(args.base.read_text())
+    head = json.loads(args.head.read_text())
+    if base.get("config") != head.get("config"):
+        print("warning: the runs used different stub API settings\n")
+
+    lines, regressed = compare(base, head, args.threshold)
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
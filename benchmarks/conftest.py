@@ -0,0 +1,158 @@
+"""Fixtures for the Jet2 benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from .results import BenchResults
+from .stub_api import StubConfig, StubJet2API
+
+DEFAULT_SIZES = "1,10,100,1000"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options describing the workload."""
+    group = parser.getgroup("jet2 benchmarks")
+    group.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help="Comma separated numbers of bookings to set up",
+    )
+    group.addoption(
+        "--bench-latency", type=float, default=StubConfig.latency, help="Seconds"
+    )
+    group.addoption(
+        "--bench-payload-size",
+        type=int,
+        default=StubConfig.payload_size,
+        help="Bytes per booking response",
+    )
+    group.addoption("--bench-images", type=int, default=StubConfig.images)
+    group.addoption("--bench-image-size", type=int, default=StubConfig.image_size)
+    group.addoption(
+        "--bench-error-rate",
+        type=float,
+        default=StubConfig.error_rate,
+        help="Share of booking requests answered with a 500",
+    )
+    group.addoption(
+        "--bench-rate-limit-rate",
+        type=float,
+        default=StubConfig.rate_limit_rate,
+        help="Share of booking requests answered with a 429",
+    )
+    group.addoption(
+        "--bench-throttle",
+        action="store_true",
+        help="Keep the integration's own request rate limit, which otherwise "
+        "dominates the timings of large runs",
+    )
+    group.addoption("--bench-output", default=None, help="Where to write results")
+    group.addoption(
+        "--soak-bookings", type=int, default=10, help="Bookings refreshed by the soak"
+    )
+    group.addoption(
+        "--soak-rounds", type=int, default=300, help="Refreshes of every booking"
+    )
+    group.addoption(
+        "--soak-max-growth-kib",
+        type=float,
+        default=1.0,
+        help="Memory each entity may gain over the soak before it fails",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run every benchmark for each number of bookings."""
+    if "bookings" in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption("--bench-sizes").split(",")
+            if size.strip()
+        ]
+        metafunc.parametrize("bookings", sizes)
+
+
+@pytest.fixture(scope="session")
+def stub_config(pytestconfig: pytest.Config) -> StubConfig:
+    """Return the stub API behaviour asked for on the command line."""
+    return StubConfig(
+        latency=pytestconfig.getoption("--bench-latency"),
+        payload_size=pytestconfig.getoption("--bench-payload-size"),
+        images=pytestconfig.getoption("--bench-images"),
+        image_size=pytestconfig.getoption("--bench-image-size"),
+        error_rate=pytestconfig.getoption("--bench-error-rate"),
+        rate_limit_rate=pytestconfig.getoption("--bench-rate-limit-rate"),
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_results(pytestconfig: pytest.Config, stub_config: StubConfig):
+    """Collect results from every benchmark, writing them out at the end."""
+    results = BenchResults(stub_config)
+    yield results
+    if results.benchmarks:
+        output = pytestconfig.getoption("--bench-output")
+        path = results.save(Path(output) if output else None)
+        print(f"\nBenchmark results written to {path}")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let Home Assistant load the integration from custom_components."""
+
+
+@pytest.fixture(autouse=True)
+async def enable_event_loop_debug() -> None:
+    """Measure with the event loop as it runs in production, not in debug mode."""
+    asyncio.get_running_loop().set_debug(False)
+
+
+@pytest.fixture(autouse=True)
+def cold_image_cache(tmp_path: Path) -> Generator[None]:
+    """Start every benchmark without images left on disk by earlier runs."""
+    with patch("tempfile.tempdir", str(tmp_path)):
+        yield
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Entries left retrying setup after injected errors keep their timers."""
+    return True
+
+
+@pytest.fixture
+def expected_lingering_tasks() -> bool:
+    """Background refreshes may still be running when a benchmark ends."""
+    return True
+
+
+@pytest.fixture
+def stub_api(
+    pytestconfig: pytest.Config, stub_config: StubConfig, socket_enabled: None
+) -> Generator[StubJet2API]:
+    """Serve the stand-in API and point the integration at it."""
+    api = StubJet2API(stub_config)
+    url = api.start_in_thread()
+
+    patches = [
+        patch("custom_components.jet2.coordinator.HOST", api.booking_url),
+        patch("custom_components.jet2.camera.IMAGE_HOST", url),
+    ]
+    if not pytestconfig.getoption("--bench-throttle"):
+        patches.append(patch("custom_components.jet2.throttle.RATE_LIMIT", 1e6))
+        patches.append(patch("custom_components.jet2.throttle.RATE_LIMIT_BURST", 10**6))
+
+    for item in patches:
+        item.start()
+    try:
+        yield api
+    finally:
+        for item in reversed(patches):
+            item.stop()
+        api.stop_thread()
@@ -0,0 +1,81 @@
+"""Measurements taken while the integration runs."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.helpers.entity import Entity
+
+KIB = 1024
+MIB = 1024 * KIB
+
+
+class LoopLagProbe:
+    """Measure how late the event loop wakes a task that sleeps in a loop."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize."""
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        """Sleep repeatedly, recording each oversleep."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.perf_counter() - start - self.interval)
+
+    def start(self) -> None:
+        """Start probing."""
+        self.lags.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> dict[str, float]:
+        """Stop probing and return the lag in milliseconds."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "loop_lag_max_ms": lags[-1] * 1000,
+            "loop_lag_p99_ms": lags[int(0.99 * (len(lags) - 1))] * 1000,
+        }
+
+
+@contextmanager
+def count_state_writes():
+    """Count calls to Entity.async_write_ha_state, by entity id."""
+    counts: dict[str, int] = {}
+    original = Entity.async_write_ha_state
+
+    def _counting(self: Entity) -> None:
+        counts[self.entity_id] = counts.get(self.entity_id, 0) + 1
+        original(self)
+
+    with patch.object(Entity, "async_write_ha_state", _counting):
+        yield counts
+
+
+@contextmanager
+def trace_memory():
+    """Trace allocations, yielding a dict filled in with MiB used on exit."""
+    result: dict[str, Any] = {}
+    tracemalloc.start()
+    try:
+        yield result
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["memory_current_mib"] = current / MIB
+        result["memory_peak_mib"] = peak / MIB
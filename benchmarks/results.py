@@ -0,0 +1,70 @@
+"""Benchmark results, saved as JSON so runs can be compared across commits."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import subprocess
+from typing import Any
+
+from .stub_api import StubConfig
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _git(*args: str) -> str:
+    """Return the output of a git command, empty if git is unavailable."""
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class BenchResults:
+    """Metrics recorded by every benchmark in a run."""
+
+    def __init__(self, config: StubConfig) -> None:
+        """Initialize."""
+        self.config = config
+        self.benchmarks: dict[str, dict[str, float]] = {}
+
+    def record(self, name: str, bookings: int, metrics: dict[str, float]) -> None:
+        """Add the metrics of one benchmark."""
+        self.benchmarks.setdefault(f"{name}[{bookings}]", {}).update(
+            {key: round(value, 4) for key, value in metrics.items()}
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the results with details of what was measured."""
+        from homeassistant.const import __version__ as ha_version
+
+        return {
+            "commit": _git("rev-parse", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "homeassistant": ha_version,
+            "config": asdict(self.config),
+            "benchmarks": self.benchmarks,
+        }
+
+    def save(self, path: Path | None = None) -> Path:
+        """Write the results, named after the commit unless a path is given."""
+        data = self.as_dict()
+        if path is None:
+            name = (data["commit"][:10] or "unknown") + (
+                "-dirty" if data["dirty"] else ""
+            )
+            path = RESULTS_DIR / f"{name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        return path
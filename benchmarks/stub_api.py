@@ -0,0 +1,220 @@
+"""Local stand-in for the Jet2 booking API and image host."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+import threading
+from typing import Any
+
+from aiohttp import web
+
+BOOKING_PATH = "/holidays/booking"
+IMAGE_PATH = "/images"
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Smallest valid JPEG header, followed by padding up to the image size.
+JPEG_HEADER = bytes.fromhex("ffd8ffe000104a46494600010100000100010000")
+
+
+@dataclass
+class StubConfig:
+    """How the stub API behaves."""
+
+    # Mean response time in seconds, each response varies by up to half of it.
+    latency: float = 0.05
+    # Approximate size of each booking response in bytes.
+    payload_size: int = 8 * 1024
+    # Accommodation images per booking and the size of each one.
+    images: int = 5
+    image_size: int = 64 * 1024
+    # Share of booking requests answered with a 500 or a 429.
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 0
+
+
+def booking_reference(index: int) -> str:
+    """Return the reference of the nth benchmark booking."""
+    return f"{index:08d}/B{index % 100:02d}K"
+
+
+def booking_payload(
+    reference: str, config: StubConfig, now: datetime | None = None
+) -> dict[str, Any]:
+    """Return a booking response shaped like the real API's."""
+    now = now or datetime.now()
+    rng = random.Random(reference)
+    outbound = now + timedelta(days=rng.randint(20, 200), hours=rng.randint(0, 23))
+    inbound = outbound + timedelta(days=rng.choice((3, 7, 10, 14)))
+    slug = reference.replace("/", "-").lower()
+
+    def fmt(value: datetime) -> str:
+        return value.replace(microsecond=0).strftime(DATE_FORMAT)
+
+    data: dict[str, Any] = {
+        "bookingReference": reference,
+        "holidayType": "Package",
+        "isTradeBooking": False,
+        "hasResortFlightCheckIn": rng.random() < 0.5,
+        "departure": {"airport": "Manchester"},
+        "region": "Balearics",
+        "area": "Majorca",
+        "resort": f"Resort {rng.randint(1, 50)}",
+        "hotel": {"name": f"Hotel {rng.randint(1, 500)}"},
+        "numberOfPassengers": {"adults": 2, "children": rng.randint(0, 3)},
+        "outbound": fmt(outbound),
+        "inbound": fmt(inbound),
+        "expiryDate": fmt(inbound + timedelta(days=7)),
+        "flightSummary": {
+            "outbound": {
+                "number": f"LS{rng.randint(100, 999)}",
+                "localDepartureDateTime": fmt(outbound),
+                "localArrivalDateTime": fmt(outbound + timedelta(hours=2)),
+            },
+            "inbound": {
+                "number": f"LS{rng.randint(100, 999)}",
+                "localDepartureDateTime": fmt(inbound),
+                "localArrivalDateTime": fmt(inbound + timedelta(hours=2)),
+            },
+        },
+        "checkInStatus": {
+            "checkInDate": fmt(outbound - timedelta(days=28)),
+            "checkInAllowed": False,
+        },
+        "priceBreakdown": {
+            "paymentDateDue": fmt(outbound - timedelta(days=70)),
+            "paidInFull": rng.random() < 0.5,
+            "totalPrice": rng.randint(800, 6000),
+        },
+        "accommodationImages": [
+            f"{IMAGE_PATH}/{slug}/{image}.jpg" for image in range(config.images)
+        ],
+        "holidaySummaries": [],
+    }
+
+    # Pad with summaries until the response is about the requested size, the
+    # booking is sent twice (see below).
+    summary = {"title": "Summary", "description": "x" * 200}
+    padding = max(0, config.payload_size // 2 - len(repr(data)))
+    data["holidaySummaries"] = [summary] * (padding // (len(repr(summary)) + 2))
+
+    # The integration decides which sensors to create from the top-level keys
+    # of the response, so mirror the booking there.
+    return {"success": True, **data, "data": data}
+
+
+class StubJet2API:
+    """Serve bookings and images on localhost, counting every request."""
+
+    def __init__(self, config: StubConfig | None = None) -> None:
+        """Initialize."""
+        self.config = config or StubConfig()
+        self.requests: Counter[str] = Counter()
+        self.booking_requests: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._payloads: dict[str, dict[str, Any]] = {}
+        self._image = JPEG_HEADER + bytes(
+            max(0, self.config.image_size - len(JPEG_HEADER))
+        )
+        self._runner: web.AppRunner | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.url = ""
+
+    @property
+    def booking_url(self) -> str:
+        """Return the URL standing in for the booking endpoint."""
+        return self.url + BOOKING_PATH
+
+    def reset_counters(self) -> None:
+        """Forget the requests counted so far."""
+        self.requests.clear()
+        self.booking_requests.clear()
+
+    def change_bookings(self) -> None:
+        """Open check-in on every booking served so far."""
+        for payload in self._payloads.values():
+            check_in_status = payload["data"]["checkInStatus"]
+            check_in_status["checkInAllowed"] = not check_in_status["checkInAllowed"]
+
+    async def _delay(self) -> None:
+        """Simulate the response time of the real API."""
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency * self._rng.uniform(0.5, 1.5))
+
+    async def _handle_booking(self, request: web.Request) -> web.Response:
+        """Answer a booking request."""
+        self.requests["booking"] += 1
+        body = await request.json()
+        reference = body.get("bookingReference", "")
+        self.booking_requests[reference] += 1
+        await self._delay()
+
+        roll = self._rng.random()
+        if roll < self.config.error_rate:
+            self.requests["booking_error"] += 1
+            return web.Response(status=500)
+        if roll < self.config.error_rate + self.config.rate_limit_rate:
+            self.requests["booking_rate_limited"] += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+
+        if (payload := self._payloads.get(reference)) is None:
+            payload = self._payloads[reference] = booking_payload(
+                reference, self.config
+            )
+        return web.json_response(payload)
+
+    async def _handle_image(self, request: web.Request) -> web.Response:
+        """Answer an image request."""
+        self.requests["image"] += 1
+        await self._delay()
+        return web.Response(
+            body=self._image,
+            content_type="image/jpeg",
+            headers={"ETag": '"stub"', "Cache-Control": "max-age=3600"},
+        )
+
+    async def start(self) -> str:
+        """Start serving on a free local port, returning the base URL."""
+        app = web.Application()
+        app.router.add_post(BOOKING_PATH, self._handle_booking)
+        app.router.add_get(IMAGE_PATH + "/{path:.*}", self._handle_image)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self) -> str:
+        """Serve from a thread with its own event loop, returning the base URL.
+
+        Keeps the stub's own work off the event loop being measured.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="jet2-stub-api", daemon=True
+        )
+        self._thread.start()
+        return asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+    def stop_thread(self) -> None:
+        """Stop serving and join the thread."""
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
@@ -0,0 +1,145 @@
+"""Benchmarks of setting up and refreshing many Jet2 bookings."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.jet2.binary_sensor import SENSOR_TYPES as BINARY_SENSOR_TYPES
+from custom_components.jet2.const import (
+    CONF_BOOKING_REFERENCE,
+    CONF_CALENDARS,
+    CONF_DATE_OF_BIRTH,
+    CONF_SURNAME,
+    DOMAIN,
+)
+from custom_components.jet2.coordinator import Jet2Coordinator
+from custom_components.jet2.sensor import SENSOR_TYPES
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .probes import LoopLagProbe, count_state_writes, trace_memory
+from .results import BenchResults
+from .stub_api import StubConfig, StubJet2API, booking_payload, booking_reference
+
+
+def add_entries(hass: HomeAssistant, bookings: int) -> list[MockConfigEntry]:
+    """Add a config entry for every benchmark booking."""
+    entries = []
+    for index in range(bookings):
+        reference = booking_reference(index)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=reference,
+            unique_id=reference,
+            data={
+                CONF_BOOKING_REFERENCE: reference,
+                CONF_DATE_OF_BIRTH: "01/01/1980",
+                CONF_SURNAME: "Bench",
+                CONF_CALENDARS: ["None"],
+            },
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    return entries
+
+
+def expected_entities(config: StubConfig) -> int:
+    """Return the entities the real setup should create for each booking."""
+    payload = booking_payload(booking_reference(0), config)
+    sensors = sum(description.key in payload for description in SENSOR_TYPES)
+    binary_sensors = sum(
+        description.key in payload for description in BINARY_SENSOR_TYPES
+    )
+    # Plus the booking's calendar and, with images, its camera.
+    return sensors + binary_sensors + 1 + (config.images > 0)
+
+
+async def refresh_all(hass: HomeAssistant) -> None:
+    """Refresh every booking at once, as if their intervals lined up."""
+    coordinators: dict[str, Jet2Coordinator] = hass.data[DOMAIN]
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in coordinators.values())
+    )
+    await hass.async_block_till_done()
+
+
+async def unload_all(hass: HomeAssistant, entries: list[MockConfigEntry]) -> None:
+    """Unload every entry so the next benchmark starts clean."""
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_setup_and_refresh(
+    hass: HomeAssistant,
+    stub_api: StubJet2API,
+    bench_results: BenchResults,
+    bookings: int,
+) -> None:
+    """Time a cold setup, then refreshes with unchanged and changed data."""
+    entries = add_entries(hass, bookings)
+    probe = LoopLagProbe()
+    metrics: dict[str, float] = {}
+
+    probe.start()
+    with count_state_writes() as writes:
+        start = time.perf_counter()
+        assert await async_setup_component(hass, DOMAIN, {})
+        metrics["setup_s"] = time.perf_counter() - start
+        await hass.async_block_till_done(wait_background_tasks=True)
+        metrics["settle_s"] = time.perf_counter() - start
+    metrics.update(await probe.stop())
+
+    metrics["setup_booking_requests_per_entry"] = (
+        stub_api.requests["booking"] / bookings
+    )
+    metrics["setup_image_requests_per_entry"] = stub_api.requests["image"] / bookings
+    metrics["setup_state_writes_per_entry"] = sum(writes.values()) / bookings
+    metrics["entities_per_entry"] = len(hass.states.async_all()) / bookings
+
+    stub_api.reset_counters()
+    with count_state_writes() as writes:
+        start = time.perf_counter()
+        await refresh_all(hass)
+        metrics["refresh_unchanged_s"] = time.perf_counter() - start
+    metrics["refresh_unchanged_state_writes_per_entry"] = (
+        sum(writes.values()) / bookings
+    )
+    metrics["refresh_booking_requests_per_entry"] = (
+        stub_api.requests["booking"] / bookings
+    )
+
+    stub_api.change_bookings()
+    with count_state_writes() as writes:
+        start = time.perf_counter()
+        await refresh_all(hass)
+        metrics["refresh_changed_s"] = time.perf_counter() - start
+    metrics["refresh_changed_state_writes_per_entry"] = sum(writes.values()) / bookings
+
+    bench_results.record("setup_and_refresh", bookings, metrics)
+    await unload_all(hass, entries)
+
+    # Entities missing from setup would make every number above look cheaper.
+    assert metrics["entities_per_entry"] >= expected_entities(stub_api.config)
+
+
+async def test_memory(
+    hass: HomeAssistant,
+    stub_api: StubJet2API,
+    bench_results: BenchResults,
+    bookings: int,
+) -> None:
+    """Measure memory held by the integration after setup and a refresh."""
+    entries = add_entries(hass, bookings)
+
+    with trace_memory() as memory:
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await refresh_all(hass)
+
+    memory["memory_per_entry_kib"] = memory["memory_current_mib"] * 1024 / bookings
+    bench_results.record("memory", bookings, memory)
+    await unload_all(hass, entries)
@@ -0,0 +1,64 @@
+"""Checks that calendar range queries return events overlapping the range."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from custom_components.jet2.calendar import EventIndex
+from custom_components.jet2.const import CONF_AGGREGATE_CALENDAR, DOMAIN
+from homeassistant.components.calendar import CalendarEvent
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from .test_bench_setup import add_entries, unload_all
+
+
+def event(summary: str, days: int, length: timedelta) -> CalendarEvent:
+    """Return an event starting some days from now."""
+    start = dt_util.now().replace(microsecond=0) + timedelta(days=days)
+    return CalendarEvent(start, start + length, summary)
+
+
+async def test_index_returns_running_events() -> None:
+    """Events started before the range but still running are returned."""
+    holiday = event("Holiday", 0, timedelta(days=14))
+    flight = event("Flight", 1, timedelta(hours=2))
+    later = event("Later", 30, timedelta(seconds=1))
+    index = EventIndex([later, flight, holiday])
+    start = holiday.start + timedelta(days=3)
+
+    assert index.between(start) == [holiday, later]
+    assert index.between(start, start + timedelta(days=1)) == [holiday]
+    assert index.between(flight.start, flight.end) == [holiday, flight]
+    assert index.between(holiday.end, later.start) == []
+
+    index.remove([holiday])
+    index.add([event("Next", 40, timedelta(days=7))])
+    assert [found.summary for found in index.between(start)] == ["Later", "Next"]
+
+
+async def test_calendars_return_holiday_when_queried_mid_trip(
+    hass: HomeAssistant, stub_api
+) -> None:
+    """A range starting part way through a holiday still shows the holiday."""
+    entries = add_entries(hass, 2)
+    hass.config_entries.async_update_entry(
+        entries[0], options={CONF_AGGREGATE_CALENDAR: True}
+    )
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entries[0].entry_id]
+    departure = coordinator.booking.outbound_departure
+    start = departure + timedelta(days=1)
+    end = start + timedelta(days=1)
+
+    calendars = hass.data["calendar"]
+    for entity_id in ("calendar.jet2_00000000_b00k", "calendar.jet2_all_holidays"):
+        entity = calendars.get_entity(entity_id)
+        assert entity is not None, entity_id
+        events = await entity.async_get_events(hass, start, end)
+        assert [found.start for found in events] == [departure], entity_id
+
+    await unload_all(hass, entries)
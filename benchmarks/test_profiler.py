@@ -0,0 +1,87 @@
+"""Checks that every profiler target is timed when its code runs."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+from custom_components.jet2.const import (
+    CONF_AGGREGATE_CALENDAR,
+    CONF_CALENDARS,
+    DOMAIN,
+)
+from custom_components.jet2.profiler import (
+    FORMAT_STACKS,
+    PROFILE_TARGETS,
+    async_get_profiler,
+)
+from homeassistant.components.camera import async_get_image
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .test_bench_setup import add_entries, refresh_all, unload_all
+
+# Long enough for every step below to run inside the profile.
+PROFILE_SECONDS = 3
+
+
+async def test_every_target_collects_samples(
+    hass: HomeAssistant, stub_api, tmp_path: Path
+) -> None:
+    """Drive each profiled call path and find it in the collapsed stacks."""
+    hass.config.config_dir = str(tmp_path)
+    entries = add_entries(hass, 2)
+    hass.config_entries.async_update_entry(
+        entries[0],
+        data={**entries[0].data, CONF_CALENDARS: ["None", "calendar.elsewhere"]},
+        options={CONF_AGGREGATE_CALENDAR: True},
+    )
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # In the background, waiting for the steps to finish must not wait for it.
+    profile = hass.async_create_background_task(
+        async_get_profiler(hass).async_profile(PROFILE_SECONDS, FORMAT_STACKS),
+        "jet2_test_profile",
+    )
+    await asyncio.sleep(0)
+
+    # A changed refresh, a failed one, then a restart from the snapshot.
+    stub_api.change_bookings()
+    await refresh_all(hass)
+    for payload in stub_api._payloads.values():
+        payload["success"] = False
+    await refresh_all(hass)
+    for payload in stub_api._payloads.values():
+        payload["success"] = True
+    await hass.config_entries.async_reload(entries[1].entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entries[0].entry_id]
+    start = coordinator.booking.outbound_departure
+    calendars = hass.data["calendar"]
+    for entity_id in ("calendar.jet2_00000000_b00k", "calendar.jet2_all_holidays"):
+        await calendars.get_entity(entity_id).async_get_events(
+            hass, start, start + timedelta(days=1)
+        )
+    camera = next(iter(hass.states.async_entity_ids("camera")))
+    await async_get_image(hass, camera)
+
+    result = await profile
+    stacks = Path(result["path"]).read_text(encoding="utf-8")
+    timed = {
+        name
+        for line in stacks.splitlines()
+        for name in line[: line.rindex(" ")].split(";")
+    }
+
+    missing = [
+        f"{module}.{qualname}"
+        for module, qualnames in PROFILE_TARGETS.items()
+        for qualname in qualnames
+        if qualname not in timed
+    ]
+    assert not missing, f"Profile targets never timed: {missing}"
+
+    await unload_all(hass, entries)
@@ -0,0 +1,200 @@
+"""Soak test: thousands of refreshes with changing payloads, watching memory."""
+
+from __future__ import annotations
+
+import copy
+import gc
+import random
+import tracemalloc
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockEntityPlatform
+
+from custom_components.jet2.binary_sensor import (
+    SENSOR_TYPES as BINARY_SENSOR_TYPES,
+    Jet2BinarySensor,
+)
+from custom_components.jet2.const import (
+    CONF_BOOKING_REFERENCE,
+    CONF_DATE_OF_BIRTH,
+    CONF_SURNAME,
+)
+from custom_components.jet2.coordinator import Jet2Coordinator
+from custom_components.jet2.sensor import SENSOR_TYPES, Jet2Sensor
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity import Entity
+
+from .probes import KIB
+from .results import BenchResults
+from .stub_api import StubConfig, booking_payload, booking_reference
+
+MEALS = ("Vegetarian", "Vegan", "Gluten Free", "Child", "Standard")
+
+# Each entity class soaks on its own, so a leak in one is not averaged away
+# by the others.
+ENTITY_CLASSES = {
+    "sensor": (Jet2Sensor, SENSOR_TYPES),
+    "binary_sensor": (Jet2BinarySensor, BINARY_SENSOR_TYPES),
+}
+
+
+def mutate(
+    base: dict[str, Any], rng: random.Random
+) -> tuple[dict[str, Any], dict[str, set[str]]]:
+    """Return a copy of a payload with lists that grow, shrink and reorder.
+
+    Also returns the attributes the sensors of each changed key should have.
+    """
+    payload = copy.deepcopy(base)
+    data = payload["data"]
+    passengers = [f"Passenger {number}" for number in range(rng.randint(0, 9))]
+    rng.shuffle(passengers)
+    seats = len(passengers)
+    meals = sum(rng.random() < 0.6 for _ in passengers)
+    policies = rng.randint(0, 4)
+    data["reservedSeats"] = [
+        {"passenger": name, "seat": f"{rng.randint(1, 33)}{rng.choice('ABCDEF')}"}
+        for name in passengers
+    ]
+    data["bookedMeals"] = [
+        {"passenger": name, "meal": rng.choice(MEALS)} for name in passengers[:meals]
+    ]
+    data["insurance"] = {
+        f"policy{number}": rng.randint(1, 10**6) for number in range(policies)
+    }
+    data["checkInStatus"]["checkInAllowed"] = rng.random() < 0.5
+    data["priceBreakdown"]["totalPrice"] = rng.randint(800, 6000)
+
+    expected = {
+        "reservedSeats": {
+            f"{field}{index}"
+            for index in range(seats)
+            for field in ("passenger", "seat")
+        },
+        "bookedMeals": {
+            f"{field}{index}"
+            for index in range(meals)
+            for field in ("passenger", "meal")
+        },
+        "insurance": {f"policy{number}" for number in range(policies)},
+        "checkInStatus": {"checkInDate", "checkInAllowed"},
+        "priceBreakdown": {"paymentDateDue", "paidInFull", "totalPrice"},
+    }
+    return payload, expected
+
+
+def traced_bytes() -> int:
+    """Return the bytes currently traced, after collecting garbage."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def wrong_attributes(entity: Entity, expected: dict[str, set[str]]) -> set[str]:
+    """Return attributes an entity has or lacks against its latest payload."""
+    if isinstance(entity, Jet2BinarySensor):
+        # Binary sensors show whether something is on, nothing more.
+        keys: set[str] = set()
+    elif (keys := expected.get(entity.entity_description.key)) is None:
+        return set()
+    return set(entity.extra_state_attributes or {}) ^ keys
+
+
+@pytest.mark.parametrize("entity_class", list(ENTITY_CLASSES))
+async def test_soak(
+    hass: HomeAssistant,
+    bench_results: BenchResults,
+    pytestconfig,
+    entity_class: str,
+) -> None:
+    """Refresh bookings thousands of times, failing on unbounded growth."""
+    entity_type, descriptions = ENTITY_CLASSES[entity_class]
+    bookings = pytestconfig.getoption("--soak-bookings")
+    rounds = pytestconfig.getoption("--soak-rounds")
+    max_growth = pytestconfig.getoption("--soak-max-growth-kib") * KIB
+    rng = random.Random(0)
+    config = StubConfig()
+
+    platform = MockEntityPlatform(hass)
+    coordinators: list[tuple[Jet2Coordinator, dict[str, Any]]] = []
+    expected: dict[Jet2Coordinator, dict[str, set[str]]] = {}
+    entities: list[Entity] = []
+    session = async_get_clientsession(hass)
+
+    for index in range(bookings):
+        reference = booking_reference(index)
+        base = booking_payload(reference, config)
+        coordinator = Jet2Coordinator(
+            hass,
+            session,
+            {
+                CONF_BOOKING_REFERENCE: reference,
+                CONF_DATE_OF_BIRTH: "01/01/1980",
+                CONF_SURNAME: "Soak",
+            },
+        )
+        payload, expected[coordinator] = mutate(base, rng)
+        coordinator.async_set_updated_data(payload)
+        coordinators.append((coordinator, base))
+        entities.extend(
+            entity_type(coordinator, reference, description)
+            for description in descriptions
+        )
+
+    await platform.async_add_entities(entities)
+    await hass.async_block_till_done()
+
+    def refresh_round() -> None:
+        for coordinator, base in coordinators:
+            payload, expected[coordinator] = mutate(base, rng)
+            coordinator.async_set_updated_data(payload)
+
+    # Let caches and interned strings settle before measuring.
+    warmup = max(1, rounds // 10)
+    for _ in range(warmup):
+        refresh_round()
+    await hass.async_block_till_done()
+
+    tracemalloc.start()
+    try:
+        start = traced_bytes()
+        half = (rounds - warmup) // 2
+        for _ in range(half):
+            refresh_round()
+        await hass.async_block_till_done()
+        middle = traced_bytes()
+        for _ in range(rounds - warmup - half):
+            refresh_round()
+        await hass.async_block_till_done()
+        end = traced_bytes()
+    finally:
+        tracemalloc.stop()
+
+    wrong = {
+        entity.entity_id: wrong
+        for entity in entities
+        if (wrong := wrong_attributes(entity, expected[entity.coordinator]))
+    }
+
+    # The first half still fills one-off caches, a leak shows in the second.
+    growth = end - middle
+    metrics = {
+        "soak_refreshes": bookings * rounds,
+        "soak_entities": len(entities),
+        "soak_growth_per_entity_kib": growth / len(entities) / KIB,
+        "soak_growth_first_half_kib": (middle - start) / KIB,
+        "soak_growth_second_half_kib": (end - middle) / KIB,
+        "soak_wrong_attribute_entities": len(wrong),
+    }
+    bench_results.record(f"soak_{entity_class}", bookings, metrics)
+
+    for entity in entities:
+        await entity.async_remove()
+
+    assert not wrong, f"Entity attributes do not match their payload: {wrong}"
+    assert growth <= max_growth * len(entities), (
+        f"{entity_type.__name__} memory grew {growth / KIB:.1f} KiB over the last "
+        f"{bookings * (rounds - warmup - half)} refreshes "
+        f"({growth / len(entities) / KIB:.2f} KiB per entity)"
+    )
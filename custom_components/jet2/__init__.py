@@ -2,23 +2,36 @@
 
 from __future__ import annotations
 
-import asyncio
+import functools
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .services import async_cleanup_services, async_setup_services
-
-PLATFORMS = [
-    Platform.BINARY_SENSOR,
-    Platform.CALENDAR,
-    Platform.CAMERA,
-    Platform.SENSOR,
-]
+from .const import (
+    CONF_AGGREGATE_CALENDAR,
+    CONF_BOOKING_REFERENCE,
+    CONF_CALENDARS,
+    DOMAIN,
+    SIGNAL_COORDINATORS_UPDATED,
+)
+from .coordinator import Jet2Coordinator
+from .expiry import async_track_expiry, hasBookingExpired
+from .metrics import async_get_metrics
+from .services import (
+    async_cleanup_services,
+    async_setup_archive_services,
+    async_setup_services,
+)
+from .store import async_get_snapshot_store, async_pop_validated_booking
+from .websocket_api import async_register_websocket_commands
+
+# Top-level response keys the binary sensors are created from.
+BINARY_SENSOR_KEYS = ("isTradeBooking", "hasResortFlightCheckIn", "checkInStatus")
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
@@ -26,42 +39,122 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
 
     hass.data.setdefault(DOMAIN, {})
-    hass_data = dict(entry.data)
 
     if not hass.data[DOMAIN]:
         async_setup_services(hass)
 
-    unsub_options_update_listener = entry.add_update_listener(options_update_listener)
+    unsub_options_update_listener = entry.add_update_listener(
+        functools.partial(options_update_listener, options=dict(entry.options))
+    )
 
     # Use async_on_unload to register the listener without storing it in entry data
     entry.async_on_unload(unsub_options_update_listener)
 
-    hass.data[DOMAIN][entry.entry_id] = hass_data
+    # One coordinator per booking, shared by every platform.
+    session = async_get_clientsession(hass)
+    coordinator = Jet2Coordinator(hass, session, entry.data, config_entry=entry)
+    store = await async_get_snapshot_store(hass)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if (
+        validated := async_pop_validated_booking(
+            hass, entry.data[CONF_BOOKING_REFERENCE]
+        )
+    ) is not None:
+        # Just fetched by the config flow, no need to ask again.
+        coordinator.async_set_validated_data(validated)
+    elif (snapshot := store.get(entry.entry_id)) is not None:
+        # Come up from the last good response and revalidate it later.
+        coordinator.async_set_snapshot_data(snapshot)
+
+    @callback
+    def _async_save_snapshot() -> None:
+        """Persist the latest good response."""
+        if (
+            coordinator.last_update_success
+            and coordinator.data
+            and coordinator.data.get("success")
+        ):
+            store.async_set(entry.entry_id, coordinator.data)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_snapshot))
+    _async_save_snapshot()
+
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    async_dispatcher_send(hass, SIGNAL_COORDINATORS_UPDATED)
+
+    # Stop polling and remove the booking once it expires, straight away for
+    # bookings that expired while HA was stopped.
+    entry.async_on_unload(async_track_expiry(hass, entry, coordinator))
+    if hasBookingExpired(coordinator.booking.expiry):
+        return True
+
+    # Only load the platforms this booking has data for, others are loaded
+    # later if the booking gains it.
+    coordinator.platforms = needed_platforms(entry, coordinator)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    @callback
+    def _async_load_new_platforms() -> None:
+        """Load platforms the latest data calls for."""
+        if new := needed_platforms(entry, coordinator) - coordinator.platforms:
+            coordinator.platforms |= new
+            entry.async_create_background_task(
+                hass,
+                hass.config_entries.async_forward_entry_setups(entry, new),
+                f"{DOMAIN}_load_platforms_{entry.entry_id}",
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_load_new_platforms))
+
+    if coordinator.data is None:
+        # Nothing fetched or stored yet. Fetch without holding up startup,
+        # entities are added once the booking is found.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
 
     return True
 
 
-async def options_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
+def needed_platforms(entry: ConfigEntry, coordinator: Jet2Coordinator) -> set[Platform]:
+    """Return the platforms a booking has anything to show on."""
+    # Sensors are always loaded.
+    platforms = {Platform.SENSOR}
+
+    if entry.data.get(CONF_CALENDARS) or entry.options.get(CONF_AGGREGATE_CALENDAR):
+        platforms.add(Platform.CALENDAR)
+
+    if isinstance(coordinator.data, dict) and coordinator.booking.success:
+        if any(key in coordinator.data for key in BINARY_SENSOR_KEYS):
+            platforms.add(Platform.BINARY_SENSOR)
+        if coordinator.booking.image_urls:
+            platforms.add(Platform.CAMERA)
+
+    return platforms
+
+
+async def options_update_listener(
+    hass: HomeAssistant, config_entry: ConfigEntry, options: dict | None = None
+):
     """Handle options update."""
+    # Entry data also changes when calendar sync state is saved, only the
+    # options warrant a reload.
+    if options is not None and config_entry.options == options:
+        return
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, platform)
-                for platform in PLATFORMS
-            ]
-        )
+    coordinator: Jet2Coordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
     )
 
     # Remove config entry from domain.
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_COORDINATORS_UPDATED)
 
     # If this was the last config entry, unregister the services
     if not hass.data[DOMAIN]:
@@ -70,6 +163,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the stored snapshot and metrics of a removed booking."""
+    store = await async_get_snapshot_store(hass)
+    store.async_remove(entry.entry_id)
+    async_get_metrics(hass).forget(entry.data[CONF_BOOKING_REFERENCE])
+
+
 async def handle_calendar_events(call: ServiceCall) -> None:
     """Handle calendar events."""
 
@@ -78,4 +178,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Jet2 component from yaml configuration."""
     hass.services.async_register("calendar", "get_events", handle_calendar_events)
     hass.data.setdefault(DOMAIN, {})
+    # Past trips stay queryable with no bookings configured.
+    async_setup_archive_services(hass)
+    async_register_websocket_commands(hass)
     return True
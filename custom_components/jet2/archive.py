@@ -0,0 +1,204 @@
+"""Local archive of completed Jet2 holidays."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import closing
+from datetime import date
+import json
+import sqlite3
+from typing import Any
+import zlib
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ARCHIVE_DATABASE,
+    CONF_END_DATE,
+    CONF_HOTEL,
+    CONF_INCLUDE_DATA,
+    CONF_LIMIT,
+    CONF_RESORT,
+    CONF_START_DATE,
+    DATA_ARCHIVE,
+)
+from .model import Jet2Booking
+
+# Trips returned by a query when no limit is given.
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Query fields shared by the service and the websocket command.
+QUERY_FIELDS = {
+    vol.Optional(CONF_START_DATE): cv.date,
+    vol.Optional(CONF_END_DATE): cv.date,
+    vol.Optional(CONF_RESORT): cv.string,
+    vol.Optional(CONF_HOTEL): cv.string,
+    vol.Optional(CONF_LIMIT, default=DEFAULT_LIMIT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_LIMIT)
+    ),
+    vol.Optional(CONF_INCLUDE_DATA, default=False): cv.boolean,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    booking_reference TEXT PRIMARY KEY,
+    holiday_type TEXT,
+    outbound_date TEXT,
+    inbound_date TEXT,
+    departure TEXT,
+    resort TEXT,
+    area TEXT,
+    region TEXT,
+    hotel TEXT,
+    passengers INTEGER,
+    archived_at TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trips_outbound_date ON trips (outbound_date);
+CREATE INDEX IF NOT EXISTS trips_inbound_date ON trips (inbound_date);
+-- Resort and hotel are matched ignoring case, older case sensitive indexes
+-- could not serve those lookups.
+DROP INDEX IF EXISTS trips_resort;
+DROP INDEX IF EXISTS trips_hotel;
+CREATE INDEX IF NOT EXISTS trips_resort_nocase ON trips (resort COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS trips_hotel_nocase ON trips (hotel COLLATE NOCASE);
+"""
+
+COLUMNS = (
+    "booking_reference",
+    "holiday_type",
+    "outbound_date",
+    "inbound_date",
+    "departure",
+    "resort",
+    "area",
+    "region",
+    "hotel",
+    "passengers",
+    "archived_at",
+)
+
+
+def _trip_row(booking: Jet2Booking, archived_at: str) -> tuple[Any, ...]:
+    """Return the archive row of a booking."""
+    data = booking.data
+    outbound = booking.outbound_departure or booking.outbound
+    inbound = booking.inbound_arrival or booking.inbound
+    hotel = data.get("hotel")
+    departure = data.get("departure")
+    if isinstance(departure, dict):
+        departure = next(iter(departure.values()), None)
+
+    return (
+        booking.reference,
+        booking.holiday_type,
+        outbound.date().isoformat() if outbound else None,
+        inbound.date().isoformat() if inbound else None,
+        departure if isinstance(departure, str) else None,
+        data.get("resort"),
+        data.get("area"),
+        data.get("region"),
+        hotel.get("name") if isinstance(hotel, dict) else None,
+        booking.passenger_total,
+        archived_at,
+        zlib.compress(json.dumps(data, separators=(",", ":")).encode()),
+    )
+
+
+class Jet2Archive:
+    """Completed bookings kept in SQLite, queried without any API calls."""
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.path = path
+        self._lock = asyncio.Lock()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema on first use."""
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        if not self._ready:
+            connection.executescript(SCHEMA)
+            self._ready = True
+        return connection
+
+    def _archive(self, row: tuple[Any, ...]) -> None:
+        """Insert or replace a trip."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO trips ({', '.join(COLUMNS)}, data) "
+                f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})",
+                row,
+            )
+
+    def _query(
+        self, where: list[str], params: list[Any], limit: int, include_data: bool
+    ) -> list[dict[str, Any]]:
+        """Run a trip query."""
+        columns = [*COLUMNS, "data"] if include_data else list(COLUMNS)
+        sql = f"SELECT {', '.join(columns)} FROM trips"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY outbound_date DESC LIMIT ?"
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, [*params, limit]).fetchall()
+
+        trips = []
+        for row in rows:
+            trip = dict(row)
+            if include_data:
+                trip["data"] = json.loads(zlib.decompress(trip["data"]))
+            trips.append(trip)
+        return trips
+
+    async def async_archive(self, booking: Jet2Booking, archived_at: str) -> None:
+        """Keep a completed booking."""
+        row = _trip_row(booking, archived_at)
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._archive, row)
+
+    async def async_query(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        resort: str | None = None,
+        hotel: str | None = None,
+        limit: int = DEFAULT_LIMIT,
+        include_data: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Return archived trips, most recent first."""
+        where: list[str] = []
+        params: list[Any] = []
+        if start is not None:
+            where.append("outbound_date >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            where.append("outbound_date <= ?")
+            params.append(end.isoformat())
+        if resort:
+            where.append("resort = ? COLLATE NOCASE")
+            params.append(resort)
+        if hotel:
+            where.append("hotel = ? COLLATE NOCASE")
+            params.append(hotel)
+
+        async with self._lock:
+            return await self.hass.async_add_executor_job(
+                self._query, where, params, limit, include_data
+            )
+
+
+def async_get_archive(hass: HomeAssistant) -> Jet2Archive:
+    """Return the domain-wide archive."""
+    if (archive := hass.data.get(DATA_ARCHIVE)) is None:
+        archive = hass.data[DATA_ARCHIVE] = Jet2Archive(
+            hass, hass.config.path(".storage", ARCHIVE_DATABASE)
+        )
+    return archive
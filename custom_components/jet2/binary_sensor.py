@@ -8,13 +8,13 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CONF_BOOKING_REFERENCE, DOMAIN
 from .coordinator import Jet2Coordinator
+from .entity import Jet2Entity
+from .model import entity_attributes
 
 SENSOR_TYPES = [
     BinarySensorEntityDescription(
@@ -41,29 +41,19 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
-    config = hass.data[DOMAIN][entry.entry_id]
+    coordinator: Jet2Coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    if entry.options:
-        config.update(entry.options)
+    name = entry.data[CONF_BOOKING_REFERENCE]
 
-    if entry.data:
-        session = async_get_clientsession(hass)
+    sensors = [
+        Jet2BinarySensor(coordinator, name, description)
+        for description in SENSOR_TYPES
+        if description.key in coordinator.data
+    ]
+    async_add_entities(sensors)
 
-        coordinator = Jet2Coordinator(hass, session, entry.data)
 
-        await coordinator.async_refresh()
-
-        name = entry.data[CONF_BOOKING_REFERENCE]
-
-        sensors = [
-            Jet2BinarySensor(coordinator, name, description)
-            for description in SENSOR_TYPES
-            if description.key in coordinator.data
-        ]
-        async_add_entities(sensors, update_before_add=True)
-
-
-class Jet2BinarySensor(CoordinatorEntity[Jet2Coordinator], BinarySensorEntity):
+class Jet2BinarySensor(Jet2Entity, BinarySensorEntity):
     """Define an Jet2 sensor."""
 
     def __init__(
@@ -94,34 +84,36 @@ class Jet2BinarySensor(CoordinatorEntity[Jet2Coordinator], BinarySensorEntity):
     def update_from_coordinator(self):
         """Update sensor state and attributes from coordinator data."""
         if self.success:
-            value: dict | str | bool = self.data.get(self.entity_description.key, None)
+            booking = self.coordinator.booking
+            value: dict | str | bool = booking.data.get(
+                self.entity_description.key, None
+            )
 
             if (
                 isinstance(value, dict)
                 and self.entity_description.key == "checkInStatus"
             ):
-                value = value["checkInAllowed"]
+                value = booking.check_in_allowed
 
             self._attr_is_on = bool(value)
-
-            if isinstance(value, (dict, list)):
-                for index, attribute in enumerate(value):
-                    if isinstance(attribute, (dict, list)):
-                        for attr in attribute:
-                            self.attrs[str(attr) + str(index)] = attribute[attr]
-                    else:
-                        self.attrs[attribute] = value[attribute]
+            self.attrs = entity_attributes(value)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if not self.coordinator.has_changed(self.entity_description.key):
+            return
+        self.success = bool(self.coordinator.data.get("success"))
+        if self.success:
+            self.data = self.coordinator.data.get("data")
         self.update_from_coordinator()
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle adding to Home Assistant."""
         await super().async_added_to_hass()
-        await self.async_update()
+        # The shared coordinator already holds fresh data, no need to refetch.
+        self.update_from_coordinator()
 
     async def async_remove(self) -> None:
         """Handle the removal of the entity."""
@@ -132,7 +124,7 @@ class Jet2BinarySensor(CoordinatorEntity[Jet2Coordinator], BinarySensorEntity):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.success
+        return self.success and self.coordinator.booking_found
 
     @property
     def is_on(self) -> bool | None:
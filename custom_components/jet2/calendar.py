@@ -1,23 +1,34 @@
 """Jet2 sensor platform."""
 
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
 from datetime import datetime, timedelta
-import hashlib
-import json
-import uuid
+import functools
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import CONF_BOOKING_REFERENCE, CONF_CALENDARS, DOMAIN
+from .calendar_sync import async_sync_calendars
+from .const import (
+    CONF_AGGREGATE_CALENDAR,
+    CONF_BOOKING_REFERENCE,
+    CONF_CALENDARS,
+    DATA_AGGREGATE_CALENDAR_HOSTS,
+    DOMAIN,
+    SIGNAL_COORDINATORS_UPDATED,
+)
 from .coordinator import Jet2Coordinator
+from .entity import Jet2Entity, async_add_domain_entities, async_when_found
+from .model import Jet2Booking
 
 DATE_SENSOR_TYPES = [
     SensorEntityDescription(
@@ -42,6 +53,20 @@ DATE_SENSOR_TYPES = [
     ),
 ]
 
+# Booking keys the calendar events are built from.
+EVENT_SOURCE_KEYS = (
+    "bookingReference",
+    "priceBreakdown",
+    "outbound",
+    "inbound",
+    "checkInStatus",
+    "flightSummary",
+    "hotel",
+    "resort",
+    "area",
+    "region",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -49,142 +74,145 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
-
-    config = hass.data[DOMAIN][entry.entry_id]
-    # Update our config to include new repos and remove those that have been removed.
-    if entry.options:
-        config.update(entry.options)
-
-    session = async_get_clientsession(hass)
-    coordinator = Jet2Coordinator(hass, session, entry.data)
-
-    await coordinator.async_refresh()
-
-    success = bool(coordinator.data.get("success"))
-
-    if success:
-        name = entry.data[CONF_BOOKING_REFERENCE]
-
-        calendars = entry.data[CONF_CALENDARS]
-
-        sensors = [Jet2CalendarSensor(coordinator, name)]
-
-        for calendar in calendars:
-            if calendar != "None":
-                for sensor in sensors:
-                    events = sensor.get_events(datetime.today(), hass)
-                    for event in events:
-                        await add_to_calendar(hass, calendar, event, entry)
-
-        if "None" in calendars:
-            async_add_entities(sensors, update_before_add=True)
-
-
-async def create_event(hass: HomeAssistant, service_data):
-    """Create calendar event."""
-    try:
-        await hass.services.async_call(
-            "calendar",
-            "create_event",
-            service_data,
-            blocking=True,
-            return_response=True,
-        )
-    except (ServiceValidationError, HomeAssistantError):
-        await hass.services.async_call(
-            "calendar",
-            "create_event",
-            service_data,
-            blocking=True,
+    coordinator: Jet2Coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    if entry.options.get(CONF_AGGREGATE_CALENDAR):
+        async_add_domain_entities(
+            hass,
+            entry,
+            DATA_AGGREGATE_CALENDAR_HOSTS,
+            async_add_entities,
+            lambda: [Jet2AllHolidaysCalendar()],
         )
 
+    name = entry.data[CONF_BOOKING_REFERENCE]
+    calendars = entry.data[CONF_CALENDARS]
+
+    if targets := [calendar for calendar in calendars if calendar != "None"]:
+        lock = asyncio.Lock()
+
+        async def _async_sync() -> None:
+            """Push upcoming events into the selected calendars."""
+            async with lock:
+                await async_sync_calendars(
+                    hass,
+                    entry,
+                    targets,
+                    EventIndex(booking_events(coordinator.booking)).between(
+                        dt_util.now()
+                    ),
+                )
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Encode date time object."""
-
-    def default(self, o):
-        """Encode date time object."""
-        if isinstance(o, datetime):
-            return o.isoformat()
-        return super().default(o)
-
-
-def generate_uuid_from_json(json_obj):
-    """Generate a UUID from a JSON object."""
-
-    json_string = json.dumps(json_obj, cls=DateTimeEncoder, sort_keys=True)
-
-    sha1_hash = hashlib.sha1(json_string.encode("utf-8")).digest()
-
-    return str(uuid.UUID(bytes=sha1_hash[:16]))
-
+        @callback
+        def _async_schedule_sync() -> None:
+            """Re-sync when the events may have changed."""
+            if coordinator.booking.success and coordinator.has_changed(
+                *EVENT_SOURCE_KEYS
+            ):
+                entry.async_create_background_task(
+                    hass, _async_sync(), f"{DOMAIN}_calendar_sync_{entry.entry_id}"
+                )
 
-async def get_event_uid(hass: HomeAssistant, service_data) -> str | None:
-    """Fetch the created event by matching with details in service_data."""
-    entity_id = service_data.get("entity_id")
-    start_time = service_data.get("start_date_time")
-    end_time = service_data.get("end_date_time")
+        entry.async_on_unload(coordinator.async_add_listener(_async_schedule_sync))
+        _async_schedule_sync()
 
-    try:
-        events = await hass.services.async_call(
-            "calendar",
-            "get_events",
-            {
-                "entity_id": entity_id,
-                "start_date_time": start_time,
-                "end_date_time": end_time,
-            },
-            return_response=True,
-            blocking=True,
+    if "None" in calendars:
+        async_when_found(
+            entry,
+            coordinator,
+            lambda: async_add_entities([Jet2CalendarSensor(coordinator, name)]),
         )
-    except (ServiceValidationError, HomeAssistantError):
-        events = None
-
-    if events is not None and entity_id in events:
-        for event in events[entity_id].get("events"):
-            if (
-                event["summary"] == service_data["summary"]
-                and f"{event["description"]}" == f"{service_data["description"]}"
-                and f"{event["location"]}" == f"{service_data["location"]}"
-            ):
-                return generate_uuid_from_json(service_data)
 
-    return None
 
+def booking_events(booking: Jet2Booking) -> list[CalendarEvent]:
+    """Build the calendar events of a booking from its parsed dates."""
+    events = []
+    description = f"Jet2|{booking.reference}"
+
+    for date_sensor_type in DATE_SENSOR_TYPES:
+        event_name = date_sensor_type.name
+        event_location = event_name
+        event_end = None
+
+        if date_sensor_type.key == "priceBreakdown":
+            event_start = booking.payment_due
+        elif date_sensor_type.key == "checkInStatus":
+            event_start = booking.check_in_date
+        elif date_sensor_type.key == "holiday":
+            event_start = booking.outbound_departure
+            event_end = booking.inbound_arrival
+            event_name = booking.location_name or event_name
+            event_location = booking.location or event_name
+        elif date_sensor_type.key == "outbound":
+            event_start = booking.outbound
+        else:
+            event_start = booking.inbound
+
+        if event_start is None:
+            continue
+
+        events.append(
+            CalendarEvent(
+                event_start,
+                (event_end or event_start) + timedelta(seconds=1),
+                event_name,
+                description,
+                event_location,
+                uid=f"{DOMAIN}-{booking.reference}-{date_sensor_type.key}".lower(),
+            )
+        )
 
-async def add_to_calendar(
-    hass: HomeAssistant, calendar: str, event: CalendarEvent, entry: ConfigEntry
-):
-    """Add an event to the calendar."""
+    return events
 
-    service_data = {
-        "entity_id": calendar,
-        "start_date_time": event.start,
-        "end_date_time": event.end,
-        "summary": event.summary,
-        "description": f"{event.description}",
-        "location": f"{event.location}",
-    }
 
-    uid = await get_event_uid(hass, service_data)
+def _event_start(event: CalendarEvent) -> datetime:
+    """Sort key for calendar events."""
+    return event.start
 
-    uids = entry.data.get("uids", [])
 
-    if uid not in uids:
-        await create_event(hass, service_data)
+class EventIndex:
+    """Calendar events sorted by start, answering date range queries.
 
-        created_event_uid = await get_event_uid(hass, service_data)
+    An event overlapping a range starts no earlier than the longest event
+    before it, so queries only look back that far.
+    """
 
-        if created_event_uid is not None and created_event_uid not in uids:
-            uids.append(created_event_uid)
+    def __init__(self, events: Iterable[CalendarEvent] = ()) -> None:
+        """Sort the events once."""
+        self.events = sorted(events, key=_event_start)
+        self._starts = [event.start for event in self.events]
+        self._longest = max(
+            (event.end - event.start for event in self.events), default=timedelta(0)
+        )
 
-    if uids != entry.data.get("uids", []):
-        updated_data = entry.data.copy()
-        updated_data["uids"] = uids
-        hass.config_entries.async_update_entry(entry, data=updated_data)
+    def add(self, events: Iterable[CalendarEvent]) -> None:
+        """Insert events in order."""
+        for event in events:
+            index = bisect_right(self._starts, event.start)
+            self._starts.insert(index, event.start)
+            self.events.insert(index, event)
+            # Never shrunk on removal, a longer look back is only slower.
+            self._longest = max(self._longest, event.end - event.start)
+
+    def remove(self, events: Iterable[CalendarEvent]) -> None:
+        """Remove events that were added before."""
+        for event in events:
+            index = bisect_left(self._starts, event.start)
+            while self.events[index] is not event:
+                index += 1
+            del self._starts[index]
+            del self.events[index]
+
+    def between(
+        self, start: datetime, end: datetime | None = None
+    ) -> list[CalendarEvent]:
+        """Return events running at any point from start until end."""
+        low = bisect_left(self._starts, start - self._longest)
+        high = len(self._starts) if end is None else bisect_left(self._starts, end)
+        return [event for event in self.events[low:high] if event.end > start]
 
 
-class Jet2CalendarSensor(CoordinatorEntity[Jet2Coordinator], CalendarEntity):
+class Jet2CalendarSensor(Jet2Entity, CalendarEntity):
     """Define an Jet2 sensor."""
 
     def __init__(
@@ -209,122 +237,118 @@ class Jet2CalendarSensor(CoordinatorEntity[Jet2Coordinator], CalendarEntity):
             self._attr_unique_id = f"{DOMAIN}-{name}-calendar".lower()
             self._attr_name = f"{DOMAIN.title()} - {name.upper()}"
 
+        self._index = EventIndex(booking_events(coordinator.booking))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if not self.coordinator.has_changed(*EVENT_SOURCE_KEYS):
+            return
+        self.success = bool(self.coordinator.data.get("success"))
+        if self.success:
+            self.data = self.coordinator.data.get("data")
+        self._index = EventIndex(booking_events(self.coordinator.booking))
+        self.async_write_ha_state()
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.success
+        return self.success and self.coordinator.booking_found
 
     @property
     def event(self) -> CalendarEvent | None:
-        """Return the next upcoming event."""
-        if self.success:
-            events = self.get_events(datetime.today(), self.hass)
-            return sorted(events, key=lambda c: c.start)[0]
+        """Return the current or next upcoming event."""
+        if self.success and (events := self._index.between(dt_util.now())):
+            return events[0]
         return None
 
     def get_events(
         self, start_date: datetime, hass: HomeAssistant
     ) -> list[CalendarEvent]:
         """Return calendar events."""
-        events = []
-
-        for date_sensor_type in DATE_SENSOR_TYPES:
-            event_end_raw = None
-            event_name = date_sensor_type.name
-            event_location = event_name
-            event_description = f"Jet2|{self.data["bookingReference"]}"
+        return self._index.between(start_date)
 
-            if (
-                date_sensor_type.key == "priceBreakdown"
-                and "paymentDateDue" in self.data.get(date_sensor_type.key)
-            ):
-                event_start_raw = self.data.get(date_sensor_type.key)["paymentDateDue"]
-
-            elif (
-                date_sensor_type.key == "checkInStatus"
-                and "checkInDate" in self.data.get(date_sensor_type.key)
-            ):
-                event_start_raw = self.data.get(date_sensor_type.key)["checkInDate"]
-
-            elif date_sensor_type.key == "holiday":
-                if "flightSummary" in self.data:
-                    flightSummary = self.data.get("flightSummary")
-
-                    if "outbound" in flightSummary:
-                        outbound = flightSummary["outbound"]
-
-                        if "localDepartureDateTime" in outbound:
-                            event_start_raw = outbound["localDepartureDateTime"]
-
-                    if "inbound" in flightSummary:
-                        inbound = flightSummary["inbound"]
-
-                        if "localArrivalDateTime" in inbound:
-                            event_end_raw = inbound["localArrivalDateTime"]
-
-                if "hotel" in self.data:
-                    event_name = self.data["hotel"]["name"]
-                elif "resort" in self.data:
-                    event_name = self.data["resort"]
-                elif "area" in self.data:
-                    event_name = self.data["area"]
-                elif "region" in self.data:
-                    event_name = self.data["region"]
-
-                event_location = event_name
-                if (
-                    "hotel" in self.data
-                    and "resort" in self.data
-                    and "area" in self.data
-                    and "region" in self.data
-                ):
-                    event_location = (
-                        self.data["hotel"]["name"]
-                        + ", "
-                        + self.data["resort"]
-                        + ", "
-                        + self.data["area"]
-                        + ", "
-                        + self.data["region"]
-                    )
-            else:
-                event_start_raw = self.data.get(date_sensor_type.key)
-
-            if not event_start_raw:
-                continue
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+        return self._index.between(start_date, end_date)
 
-            user_timezone = dt_util.get_time_zone(hass.config.time_zone)
 
-            start_dt_utc = datetime.strptime(
-                event_start_raw, "%Y-%m-%dT%H:%M:%S"
-            ).replace(tzinfo=user_timezone)
-            # Convert the datetime to the default timezone
-            event_start = start_dt_utc.astimezone(user_timezone)
+class Jet2AllHolidaysCalendar(CalendarEntity):
+    """Every Jet2 booking's events merged into one calendar."""
 
-            if event_end_raw is None:
-                event_end_raw = event_start_raw
+    _attr_should_poll = False
 
-            end_dt_utc = datetime.strptime(event_end_raw, "%Y-%m-%dT%H:%M:%S").replace(
-                tzinfo=user_timezone
+    def __init__(self) -> None:
+        """Initialize."""
+        self._attr_unique_id = f"{DOMAIN}-all-holidays-calendar"
+        self._attr_name = f"{DOMAIN.title()} - All Holidays"
+        self._events: dict[str, list[CalendarEvent]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._index = EventIndex()
+
+    async def async_added_to_hass(self) -> None:
+        """Start following every booking's coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_COORDINATORS_UPDATED, self._async_track_coordinators
             )
+        )
+        self.async_on_remove(self._async_untrack_coordinators)
+        self._async_track_coordinators()
+
+    @callback
+    def _async_untrack_coordinators(self) -> None:
+        """Stop following every coordinator."""
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+
+    @callback
+    def _async_track_coordinators(self) -> None:
+        """Follow bookings that were added and drop those that were removed."""
+        coordinators: dict[str, Jet2Coordinator] = self.hass.data.get(DOMAIN, {})
+
+        for entry_id in set(self._unsubs) - set(coordinators):
+            self._unsubs.pop(entry_id)()
+            self._index.remove(self._events.pop(entry_id, ()))
+
+        for entry_id, coordinator in coordinators.items():
+            if entry_id in self._unsubs:
+                continue
+            self._unsubs[entry_id] = coordinator.async_add_listener(
+                functools.partial(self._async_coordinator_updated, entry_id)
+            )
+            self._set_events(entry_id, booking_events(coordinator.booking))
 
-            # Convert the datetime to the default timezone
-            event_end = end_dt_utc.astimezone(user_timezone)
+        self.async_write_ha_state()
 
-            event_end += timedelta(seconds=1)
+    def _set_events(self, entry_id: str, events: list[CalendarEvent]) -> None:
+        """Replace the events of one booking in the merged index."""
+        self._index.remove(self._events.get(entry_id, ()))
+        self._index.add(events)
+        self._events[entry_id] = events
 
-            if event_start.date() >= start_date.date():
-                events.append(
-                    CalendarEvent(
-                        event_start,
-                        event_end,
-                        event_name,
-                        event_description,
-                        event_location,
-                    )
-                )
+    @callback
+    def _async_coordinator_updated(self, entry_id: str) -> None:
+        """Re-index only the booking that changed."""
+        coordinator: Jet2Coordinator | None = self.hass.data[DOMAIN].get(entry_id)
+        if coordinator is None or not coordinator.has_changed(*EVENT_SOURCE_KEYS):
+            return
+        self._set_events(entry_id, booking_events(coordinator.booking))
+        self.async_write_ha_state()
 
-        return events
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next event across every booking."""
+        if events := self._index.between(dt_util.now()):
+            return events[0]
+        return None
 
     async def async_get_events(
         self,
@@ -332,9 +356,5 @@ class Jet2CalendarSensor(CoordinatorEntity[Jet2Coordinator], CalendarEntity):
         start_date: datetime,
         end_date: datetime,
     ) -> list[CalendarEvent]:
-        """Return calendar events within a datetime range."""
-        return [
-            event
-            for event in self.get_events(start_date, hass)
-            if event.start.date() <= end_date.date()
-        ]
+        """Return every booking's events within a datetime range."""
+        return self._index.between(start_date, end_date)
@@ -0,0 +1,243 @@
+"""Reconcile Jet2 booking events into external calendars."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+from datetime import timedelta
+import hashlib
+import logging
+from typing import Any
+
+from homeassistant.components.calendar import (
+    DOMAIN as CALENDAR_DOMAIN,
+    CalendarEntity,
+    CalendarEntityFeature,
+    CalendarEvent,
+)
+from homeassistant.components.calendar.const import (
+    EVENT_DESCRIPTION,
+    EVENT_END,
+    EVENT_LOCATION,
+    EVENT_START,
+    EVENT_SUMMARY,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_SYNCED_EVENTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Calendar writes in flight at once, across every target calendar.
+SYNC_CONCURRENCY = 4
+
+
+def event_fingerprint(event: CalendarEvent) -> str:
+    """Return a hash of the fields we write to a calendar."""
+    return hashlib.sha1(
+        "|".join(
+            (
+                event.start.isoformat(),
+                event.end.isoformat(),
+                event.summary,
+                f"{event.description}",
+                f"{event.location}",
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def _event_data(event: CalendarEvent) -> dict[str, Any]:
+    """Return the fields used to create or update an event."""
+    return {
+        EVENT_START: event.start,
+        EVENT_END: event.end,
+        EVENT_SUMMARY: event.summary,
+        EVENT_DESCRIPTION: f"{event.description}",
+        EVENT_LOCATION: f"{event.location}",
+    }
+
+
+def _matches(existing: CalendarEvent, event: CalendarEvent) -> bool:
+    """Return True if an event in a calendar is the one we would write."""
+    return (
+        existing.summary == event.summary
+        and existing.start == event.start
+        and f"{existing.description}" == f"{event.description}"
+    )
+
+
+class CalendarSync:
+    """Sync the desired events of one booking into one calendar."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity: CalendarEntity,
+        events: dict[str, CalendarEvent],
+        synced: dict[str, dict[str, str]],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entity = entity
+        self.events = events
+        self.synced = dict(synced)
+        self.semaphore = semaphore
+        features = entity.supported_features or 0
+        self.can_update = bool(features & CalendarEntityFeature.UPDATE_EVENT)
+        self.can_delete = bool(features & CalendarEntityFeature.DELETE_EVENT)
+
+    async def _async_limited(self, job: Awaitable[Any]) -> bool:
+        """Run a calendar write with bounded parallelism."""
+        async with self.semaphore:
+            try:
+                await job
+            except (HomeAssistantError, ValueError) as err:
+                _LOGGER.warning(
+                    "Unable to update %s with Jet2 events: %s",
+                    self.entity.entity_id,
+                    err,
+                )
+                return False
+        return True
+
+    async def _async_fetch_window(self) -> list[CalendarEvent]:
+        """Fetch every event in the window the booking spans, once."""
+        starts = [event.start for event in self.events.values()]
+        starts.extend(
+            start
+            for record in self.synced.values()
+            if (start := dt_util.parse_datetime(record.get("start", ""))) is not None
+        )
+        if not starts:
+            return []
+
+        ends = [event.end for event in self.events.values()]
+        return await self.entity.async_get_events(
+            self.hass,
+            min(starts) - timedelta(days=1),
+            max(starts + ends) + timedelta(days=1),
+        )
+
+    def _record(self, event_id: str, uid: str, event: CalendarEvent) -> None:
+        """Remember where an event was written."""
+        self.synced[event_id] = {
+            "uid": uid,
+            "hash": event_fingerprint(event),
+            "start": event.start.isoformat(),
+        }
+
+    async def async_sync(self) -> dict[str, dict[str, str]]:
+        """Create, update and delete events, returning the new sync state."""
+        existing = await self._async_fetch_window()
+        by_uid = {event.uid: event for event in existing if event.uid}
+
+        updates: dict[str, Awaitable[Any]] = {}
+        deletes: list[Awaitable[Any]] = []
+        creates: dict[str, Awaitable[Any]] = {}
+
+        for event_id, event in self.events.items():
+            record = self.synced.get(event_id)
+
+            if record is not None and record.get("uid") in by_uid:
+                if record.get("hash") == event_fingerprint(event):
+                    continue
+                if self.can_update:
+                    updates[event_id] = self.entity.async_update_event(
+                        record["uid"], _event_data(event)
+                    )
+                    continue
+                if not self.can_delete:
+                    continue
+                deletes.append(self.entity.async_delete_event(record["uid"]))
+            elif (
+                match := next(
+                    (item for item in existing if item.uid and _matches(item, event)),
+                    None,
+                )
+            ) is not None:
+                # Adopt an identical event, e.g. one written before sync state
+                # was kept, rather than creating a duplicate.
+                self._record(event_id, match.uid, event)
+                continue
+
+            self.synced.pop(event_id, None)
+            creates[event_id] = self.entity.async_create_event(**_event_data(event))
+
+        now = dt_util.now()
+        for event_id in set(self.synced) - set(self.events):
+            start = dt_util.parse_datetime(self.synced[event_id].get("start", ""))
+            if start is not None and start < now:
+                # Events that already happened are history, leave them be.
+                continue
+            record = self.synced.pop(event_id)
+            if self.can_delete and record.get("uid") in by_uid:
+                deletes.append(self.entity.async_delete_event(record["uid"]))
+
+        jobs = [*updates.values(), *deletes, *creates.values()]
+        results = await asyncio.gather(*(self._async_limited(job) for job in jobs))
+
+        for event_id, success in zip(updates, results):
+            if success:
+                self._record(
+                    event_id, self.synced[event_id]["uid"], self.events[event_id]
+                )
+
+        if creates:
+            # Creating does not return the new uid, look them all up at once.
+            existing = await self._async_fetch_window()
+            for event_id in creates:
+                event = self.events[event_id]
+                match = next(
+                    (item for item in existing if item.uid and _matches(item, event)),
+                    None,
+                )
+                if match is not None:
+                    self._record(event_id, match.uid, event)
+
+        return self.synced
+
+
+async def async_sync_calendars(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    calendars: list[str],
+    events: list[CalendarEvent],
+) -> None:
+    """Reconcile a booking's events into every selected external calendar."""
+    component = hass.data.get(CALENDAR_DOMAIN)
+    if component is None:
+        return
+
+    desired = {event.uid: event for event in events if event.uid}
+    state: dict[str, dict[str, dict[str, str]]] = entry.data.get(CONF_SYNCED_EVENTS, {})
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+
+    syncs = {}
+    for calendar in calendars:
+        if (entity := component.get_entity(calendar)) is None:
+            _LOGGER.debug("Calendar %s is not available to sync into", calendar)
+            continue
+        syncs[calendar] = CalendarSync(
+            hass, entity, desired, state.get(calendar, {}), semaphore
+        )
+
+    results = await asyncio.gather(
+        *(sync.async_sync() for sync in syncs.values()), return_exceptions=True
+    )
+
+    new_state = dict(state)
+    for calendar, result in zip(syncs, results):
+        if isinstance(result, Exception):
+            _LOGGER.warning("Unable to sync Jet2 events to %s: %s", calendar, result)
+            continue
+        new_state[calendar] = result
+
+    if new_state != state or "uids" in entry.data:
+        data = {key: value for key, value in entry.data.items() if key != "uids"}
+        data[CONF_SYNCED_EVENTS] = new_state
+        hass.config_entries.async_update_entry(entry, data=data)
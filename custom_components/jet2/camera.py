@@ -1,17 +1,15 @@
 """Camera sensor for Jet2."""
 
-import requests
-
 from homeassistant.components.camera import Camera, CameraEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_BOOKING_REFERENCE, DOMAIN
+from .const import CONF_BOOKING_REFERENCE, DOMAIN, IMAGE_HOST
 from .coordinator import Jet2Coordinator
+from .entity import Jet2Entity
+from .image_cache import async_get_image_cache
 
 SENSOR_DESCRIPTION = CameraEntityDescription(
     key="accommodationImages",
@@ -26,21 +24,32 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
-    config = hass.data[DOMAIN][entry.entry_id]
-
-    session = async_get_clientsession(hass)
-
-    coordinator = Jet2Coordinator(hass, session, config)
-
-    await coordinator.async_refresh()
+    coordinator: Jet2Coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    name = config[CONF_BOOKING_REFERENCE]
+    name = entry.data[CONF_BOOKING_REFERENCE]
 
     sensors = [Jet2CameraSensor(coordinator, name, SENSOR_DESCRIPTION)]
-    async_add_entities(sensors, update_before_add=True)
+    async_add_entities(sensors)
+
+    @callback
+    def _async_prefetch_images() -> None:
+        """Warm the image cache with every accommodation image."""
+        if not coordinator.booking.success:
+            return
+        if image_urls := coordinator.booking.image_urls:
+            entry.async_create_background_task(
+                hass,
+                async_get_image_cache(hass).async_prefetch(
+                    IMAGE_HOST + image_url for image_url in image_urls
+                ),
+                f"{DOMAIN}_prefetch_images_{entry.entry_id}",
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_prefetch_images))
+    _async_prefetch_images()
 
 
-class Jet2CameraSensor(CoordinatorEntity[Jet2Coordinator], Camera):
+class Jet2CameraSensor(Jet2Entity, Camera):
     """Representation of a Camera entity."""
 
     def __init__(
@@ -58,20 +67,13 @@ class Jet2CameraSensor(CoordinatorEntity[Jet2Coordinator], Camera):
         self._image_urls = None
 
         if self.success:
-            self.data = coordinator.data.get("data")
-
-            if "hotel" in self.data:
-                self._name = self.data["hotel"]["name"]
-            elif "resort" in self.data:
-                self._name = self.data["resort"]
-            elif "area" in self.data:
-                self._name = self.data["area"]
-            elif "region" in self.data:
-                self._name = self.data["region"]
+            booking = coordinator.booking
+            self.data = booking.data
+            self._name = booking.location_name or self._name
 
             self.entity_description = description
             self._current_index = 0
-            self._image_urls = self.data["accommodationImages"]
+            self._image_urls = booking.image_urls
 
             # Setup unique ID and entity ID
             self._attr_unique_id = f"{DOMAIN}-{name}-{description.key}-camera".lower()
@@ -86,10 +88,28 @@ class Jet2CameraSensor(CoordinatorEntity[Jet2Coordinator], Camera):
                 configuration_url="https://github.com/jampez77/Jet2/",
             )
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if not self.coordinator.has_changed(
+            "accommodationImages", "hotel", "resort", "area", "region"
+        ):
+            return
+        self.success = bool(self.coordinator.data.get("success"))
+        if self.success:
+            booking = self.coordinator.booking
+            self.data = booking.data
+            self._image_urls = booking.image_urls
+            if self._current_index >= len(self._image_urls):
+                self._current_index = 0
+        self.async_write_ha_state()
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return bool(self.success and len(self._image_urls) > 0)
+        return bool(
+            self.success and self.coordinator.booking_found and self._image_urls
+        )
 
     @property
     def name(self) -> str:
@@ -101,19 +121,19 @@ class Jet2CameraSensor(CoordinatorEntity[Jet2Coordinator], Camera):
         """Return True if the camera is streaming."""
         return bool(self.success and len(self._image_urls) > 0)
 
-    def camera_image(self, width: int = 0, height: int = 0) -> bytes:
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
         """Return the image to serve for the camera entity."""
-        if not self.success or self._image_urls is None:
+        if not self.success or not self._image_urls:
             return None
 
         # Get the current image URL
-        image_url = (
-            "https://www.jet2holidays.com" + self._image_urls[self._current_index]
-        )
+        image_url = IMAGE_HOST + self._image_urls[self._current_index]
 
         # Rotate to the next image
         self._current_index = (self._current_index + 1) % len(self._image_urls)
 
-        # Fetch and return the image content
-        response = requests.get(image_url, timeout=10)
-        return response.content
+        return await async_get_image_cache(self.hass).async_get(
+            image_url, width, height
+        )
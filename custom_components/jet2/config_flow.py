@@ -21,6 +21,8 @@ import homeassistant.helpers.config_validation as cv
 from .const import (
     ADD_BOOKING,
     BOOKING_OPTION,
+    CONF_AGGREGATE_CALENDAR,
+    CONF_API_HEALTH_SENSORS,
     CONF_BOOKING_REFERENCE,
     CONF_CALENDARS,
     CONF_DATE_OF_BIRTH,
@@ -29,9 +31,15 @@ from .const import (
     REMOVE_BOOKING,
 )
 from .coordinator import Jet2Coordinator
+from .metrics import async_get_metrics
+from .store import async_stash_validated_booking
 
 _LOGGER = logging.getLogger(__name__)
 
+# Options controlling entities shared by every booking, kept the same on all
+# entries.
+SHARED_OPTIONS = (CONF_AGGREGATE_CALENDAR, CONF_API_HEALTH_SENSORS)
+
 STEP_BOOKING_OPTION_SCHEMA = vol.Schema(
     {
         vol.Required(BOOKING_OPTION, default=ADD_BOOKING): vol.In(
@@ -87,7 +95,17 @@ def is_date_valid_format(value: str) -> bool:
 @callback
 def async_get_options_flow(config_entry):
     """Jet2 flow handler."""
-    return Jet2FlowHandler(config_entry)
+    return Jet2FlowHandler()
+
+
+@callback
+def async_shared_options(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the shared options, enabled if any entry enables them."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    return {
+        key: any(entry.options.get(key, False) for entry in entries)
+        for key in SHARED_OPTIONS
+    }
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
@@ -100,8 +118,16 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     await coordinator.async_refresh()
 
     if coordinator.last_exception is not None and data is not None:
+        # The booking is not added, so nothing would forget its metrics.
+        async_get_metrics(hass).forget(data[CONF_BOOKING_REFERENCE])
         raise InvalidAuth
 
+    if isinstance(coordinator.data, dict) and coordinator.data.get("success"):
+        # Spare the new entry fetching the same booking again.
+        async_stash_validated_booking(
+            hass, data[CONF_BOOKING_REFERENCE], coordinator.data
+        )
+
     return {"title": str(data[CONF_BOOKING_REFERENCE]).upper()}
 
 
@@ -110,6 +136,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return Jet2FlowHandler()
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
 
@@ -164,7 +196,11 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                     _LOGGER.exception("Unexpected exception")
                     errors["base"] = "unknown"
                 else:
-                    return self.async_create_entry(title=info["title"], data=user_input)
+                    return self.async_create_entry(
+                        title=info["title"],
+                        data=user_input,
+                        options=async_shared_options(self.hass),
+                    )
 
         return self.async_show_form(
             step_id="user",
@@ -181,7 +217,9 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                 self._abort_if_unique_id_configured()
 
                 return self.async_create_entry(
-                    title=import_data[CONF_BOOKING_REFERENCE], data=import_data
+                    title=import_data[CONF_BOOKING_REFERENCE],
+                    data=import_data,
+                    options=async_shared_options(self.hass),
                 )
             except Exception as e:  # pylint: disable=broad-except
                 _LOGGER.error("Failed to import booking: %s", e)
@@ -194,15 +232,33 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 class Jet2FlowHandler(config_entries.OptionsFlow):
     """Jet2 flow handler."""
 
-    def __init__(self, config_entry) -> None:
-        """Init."""
-        self.config_entry = config_entry
-
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Init."""
+        if user_input is not None:
+            # Every other booking reloads with the same shared options.
+            for entry in self.hass.config_entries.async_entries(DOMAIN):
+                if entry.entry_id != self.config_entry.entry_id:
+                    self.hass.config_entries.async_update_entry(
+                        entry, options={**entry.options, **user_input}
+                    )
+            return self.async_create_entry(title="", data=user_input)
+
+        shared = async_shared_options(self.hass)
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({}),
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_AGGREGATE_CALENDAR,
+                        default=shared[CONF_AGGREGATE_CALENDAR],
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_API_HEALTH_SENSORS,
+                        default=shared[CONF_API_HEALTH_SENSORS],
+                    ): cv.boolean,
+                }
+            ),
         )
 
 
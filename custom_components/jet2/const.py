@@ -9,9 +9,44 @@ CONF_DATEOFBIRTH = "dateOfbirth"
 CONF_SURNAME = "surname"
 CONF_ADD_BOOKING = "add_booking"
 CONF_REMOVE_BOOKING = "remove_booking"
+CONF_ADD_BOOKINGS = "add_bookings"
+CONF_REMOVE_BOOKINGS = "remove_bookings"
+CONF_BOOKINGS = "bookings"
+CONF_BOOKING_REFERENCES = "booking_references"
 CONF_BOOKING_REMOVED = "booking_removed"
 CONF_CALENDARS = "calendars"
 CONF_CREATE_CALENDAR = "create_calendar"
+CONF_SYNCED_EVENTS = "synced_events"
+CONF_AGGREGATE_CALENDAR = "aggregate_calendar"
+CONF_API_HEALTH_SENSORS = "api_health_sensors"
 ADD_BOOKING = "Add Booking"
 REMOVE_BOOKING = "Remove Booking"
 BOOKING_OPTION = "booking_option"
+DATA_SNAPSHOT_STORE = "jet2_snapshot_store"
+DATA_VALIDATED_BOOKINGS = "jet2_validated_bookings"
+STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = "jet2.snapshots"
+IMAGE_HOST = "https://www.jet2holidays.com"
+DATA_IMAGE_CACHE = "jet2_image_cache"
+IMAGE_STORAGE_KEY = "jet2.images"
+IMAGE_CACHE_DIR = "jet2_images"
+DATA_RATE_LIMITER = "jet2_rate_limiter"
+DATA_CIRCUIT_BREAKER = "jet2_circuit_breaker"
+DATA_SINGLE_FLIGHT = "jet2_single_flight"
+DATA_METRICS = "jet2_metrics"
+DATA_AGGREGATE_CALENDAR_HOSTS = "jet2_aggregate_calendar_hosts"
+DATA_API_HEALTH_HOSTS = "jet2_api_health_hosts"
+DATA_PROFILER = "jet2_profiler"
+SIGNAL_COORDINATORS_UPDATED = "jet2_coordinators_updated"
+DATA_ARCHIVE = "jet2_archive"
+ARCHIVE_DATABASE = "jet2_archive.db"
+CONF_GET_ARCHIVED_TRIPS = "get_archived_trips"
+CONF_START_DATE = "start_date"
+CONF_END_DATE = "end_date"
+CONF_RESORT = "resort"
+CONF_HOTEL = "hotel"
+CONF_LIMIT = "limit"
+CONF_INCLUDE_DATA = "include_data"
+CONF_PROFILE = "profile"
+CONF_DURATION = "duration"
+CONF_FORMAT = "format"
@@ -1,12 +1,21 @@
 """Jet2 Coordinator."""
 
-from datetime import timedelta
+import asyncio
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
 import logging
+import random
+import time
 
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONTENT_TYPE_JSON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_BOOKING_REFERENCE,
@@ -16,62 +25,156 @@ from .const import (
     CONF_SURNAME,
     HOST,
 )
+from .metrics import BookingMetrics, async_get_metrics
+from .model import Jet2Booking
+from .scheduler import (
+    MIN_UPDATE_INTERVAL,
+    first_interval,
+    plan_update_interval,
+    retry_interval,
+    stagger,
+)
+from .throttle import (
+    async_get_circuit_breaker,
+    async_get_rate_limiter,
+    async_get_single_flight,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 2
+BACKOFF_MAX = 30
+# Longer Retry-After values pause all requests instead of waiting inline.
+MAX_RETRY_AFTER = 30
+
 
 class Jet2Coordinator(DataUpdateCoordinator):
     """Data coordinator."""
 
-    def __init__(self, hass: HomeAssistant, session, data: dict) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session,
+        data: dict,
+        config_entry: ConfigEntry | None = None,
+    ) -> None:
         """Initialize coordinator."""
 
         super().__init__(
             hass,
             _LOGGER,
+            # None when validating a booking before it has an entry.
+            config_entry=config_entry,
             # Name of the data. For logging purposes.
             name="Jet2",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(minutes=5),
+            # Re-planned from the booking itinerary after every refresh.
+            update_interval=MIN_UPDATE_INTERVAL,
+            # Identical responses do not notify listeners.
+            always_update=False,
         )
         self.session = session
         self.booking_reference = data[CONF_BOOKING_REFERENCE]
         self.date_of_birth = data[CONF_DATE_OF_BIRTH]
         self.surname = data[CONF_SURNAME]
+        self.metrics = async_get_metrics(hass).booking(self.booking_reference)
+        self.fingerprint: str | None = None
+        self._booking: Jet2Booking | None = None
+        self._booking_source: dict | None = None
+        # Keys that changed in the last refresh, None when everything may have.
+        self.changed_keys: frozenset[str] | None = None
+        # False while the API says the booking cannot be found, the last good
+        # data is kept until the booking expires or is removed.
+        self.booking_found = True
+        self.failed_refreshes = 0
+        self.max_attempts = MAX_ATTEMPTS
+        # Platforms forwarded for this booking.
+        self.platforms: set[str] = set()
+
+    @property
+    def booking(self) -> Jet2Booking:
+        """Return the parsed booking for the current data."""
+        if self._booking is None or self._booking_source is not self.data:
+            self._set_booking(self.data)
+        return self._booking
+
+    def _set_booking(self, body: dict | None) -> None:
+        """Parse a response into the shared booking model."""
+        self._booking = Jet2Booking(
+            body, dt_util.get_time_zone(self.hass.config.time_zone)
+        )
+        self._booking_source = body
+
+    @callback
+    def async_set_updated_data(self, data) -> None:
+        """Set data from outside a refresh, e.g. a stored snapshot."""
+        self.fingerprint = None
+        self.changed_keys = None
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_set_validated_data(self, body: dict) -> None:
+        """Adopt a response fetched moments ago as the first refresh."""
+        self._set_booking(body)
+        self.update_interval = stagger(
+            plan_update_interval(self._booking, dt_util.now())
+        )
+        super().async_set_updated_data(body)
+        self.fingerprint = fingerprint_response(body)
+        self.changed_keys = None
+
+    @callback
+    def async_set_snapshot_data(self, body: dict) -> None:
+        """Come up from a stored response, revalidating it later."""
+        self.async_set_updated_data(body)
+        # Bookings restored together first poll at random points of their
+        # intervals instead of all at once, later polls are staggered.
+        self.update_interval = first_interval(
+            plan_update_interval(self.booking, dt_util.now())
+        )
+
+    def has_changed(self, *keys: str) -> bool:
+        """Return True if any of the keys changed in the last refresh."""
+        if self.changed_keys is None or "success" in self.changed_keys:
+            return True
+        return not self.changed_keys.isdisjoint(keys)
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
 
-        def handle_status_code(status_code):
-            if status_code == 401:
-                raise InvalidAuth("Invalid authentication credentials")
-            if status_code == 429:
-                raise APIRatelimitExceeded("API rate limit exceeded.")
-
         def validate_response(body):
             if not isinstance(body, dict):
                 raise TypeError("Unexpected response format")
 
+        self.changed_keys = frozenset()
+        started = time.monotonic()
+        refreshed = False
+
         try:
-            resp = await self.session.request(
-                method="POST",
-                url=HOST,
-                json={
-                    CONF_BOOKINGREFERENCE: self.booking_reference,
-                    CONF_DATEOFBIRTH: self.date_of_birth,
-                    CONF_SURNAME: self.surname,
-                },
-                headers={"Content-Type": CONTENT_TYPE_JSON},
+            body = await async_fetch_booking(
+                self.hass,
+                self.session,
+                self.booking_reference,
+                self.date_of_birth,
+                self.surname,
+                self.max_attempts,
             )
 
-            handle_status_code(resp.status)
-
-            body = await resp.json()
-
             validate_response(body)
+            if not body.get("success"):
+                raise BookingNotFound(f"Booking {self.booking_reference} not found")
 
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
+        except BookingNotFound as err:
+            self.metrics.errors[type(err).__name__] += 1
+            if self.booking_found:
+                # Entities must be rewritten to show they are unavailable.
+                self.booking_found = False
+                self.changed_keys = None
+            raise UpdateFailed(str(err)) from err
         except Jet2Error as err:
             raise UpdateFailed(str(err)) from err
         except ValueError as err:
@@ -79,9 +182,222 @@ class Jet2Coordinator(DataUpdateCoordinator):
             raise UpdateFailed(f"Unexpected response: {err}") from err
         except Exception as err:
             _LOGGER.error("Unexpected exception: %s", err)
+            self.metrics.errors[UnknownError.__name__] += 1
             raise UnknownError from err
         else:
+            fingerprint = fingerprint_response(body)
+            if fingerprint == self.fingerprint and self.data is not None:
+                # Unchanged, hand back the same object so nothing is rewritten.
+                body = self.data
+                booking = self.booking
+                self.metrics.responses_unchanged += 1
+            else:
+                self.metrics.responses_changed += 1
+                self.changed_keys = diff_keys(self.data, body)
+                self.fingerprint = fingerprint
+                self._set_booking(body)
+                booking = self._booking
+
+            if not self.booking_found:
+                self.booking_found = True
+                self.changed_keys = None
+
+            refreshed = True
+            self.failed_refreshes = 0
+            self.metrics.api_health.record_refresh()
+            self.update_interval = stagger(plan_update_interval(booking, dt_util.now()))
+            _LOGGER.debug(
+                "Next refresh of %s in %s", self.booking_reference, self.update_interval
+            )
             return body
+        finally:
+            self.metrics.update_duration.record(time.monotonic() - started)
+            if not refreshed:
+                # Retry soon rather than waiting out a plan of up to 12 hours.
+                self.failed_refreshes += 1
+                self.update_interval = stagger(
+                    retry_interval(self.booking, dt_util.now(), self.failed_refreshes)
+                )
+
+
+def fingerprint_response(body: dict) -> str:
+    """Return a stable hash of a response body."""
+    return hashlib.blake2b(
+        json.dumps(body, sort_keys=True, separators=(",", ":")).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def diff_keys(previous: dict | None, body: dict) -> frozenset[str] | None:
+    """Return the top-level and booking keys that differ between responses."""
+    if not isinstance(previous, dict):
+        return None
+
+    changed = {
+        key
+        for key in previous.keys() | body.keys()
+        if key != "data" and previous.get(key) != body.get(key)
+    }
+
+    previous_data = previous.get("data")
+    data = body.get("data")
+    if isinstance(previous_data, dict) and isinstance(data, dict):
+        changed.update(
+            key
+            for key in previous_data.keys() | data.keys()
+            if previous_data.get(key) != data.get(key)
+        )
+    elif previous_data != data:
+        return None
+
+    return frozenset(changed)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a Retry-After header."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for an attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+async def _async_request_booking(
+    session: aiohttp.ClientSession,
+    booking_reference: str,
+    date_of_birth: str,
+    surname: str,
+    metrics: BookingMetrics,
+):
+    """Make a single booking request."""
+    async with session.post(
+        HOST,
+        json={
+            CONF_BOOKINGREFERENCE: booking_reference,
+            CONF_DATEOFBIRTH: date_of_birth,
+            CONF_SURNAME: surname,
+        },
+        headers={"Content-Type": CONTENT_TYPE_JSON},
+        timeout=REQUEST_TIMEOUT,
+    ) as resp:
+        if resp.status == 401:
+            raise InvalidAuth("Invalid authentication credentials")
+        if resp.status == 429:
+            raise APIRatelimitExceeded(
+                "API rate limit exceeded.",
+                retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+            )
+        if resp.status >= 500:
+            resp.raise_for_status()
+
+        metrics.bytes_received += len(await resp.read())
+        try:
+            return await resp.json()
+        except aiohttp.ContentTypeError as err:
+            raise UnknownError(f"Unexpected content type: {err.message}") from err
+
+
+async def async_fetch_booking(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    booking_reference: str,
+    date_of_birth: str,
+    surname: str,
+    max_attempts: int = MAX_ATTEMPTS,
+):
+    """Fetch a booking, sharing the request with concurrent identical callers."""
+    single_flight = async_get_single_flight(hass)
+    # Callers only share a fetch that retries as often as each of them asked.
+    key = (booking_key(booking_reference, date_of_birth, surname), max_attempts)
+    if single_flight.in_flight(key):
+        async_get_metrics(hass).booking(booking_reference).shared_fetches += 1
+    return await single_flight.async_run(
+        key,
+        lambda: _async_fetch_booking(
+            hass, session, booking_reference, date_of_birth, surname, max_attempts
+        ),
+    )
+
+
+def booking_key(
+    booking_reference: str, date_of_birth: str, surname: str
+) -> tuple[str, str, str]:
+    """Return the key identifying identical booking requests."""
+    return (
+        booking_reference.strip().upper(),
+        surname.strip().lower(),
+        hashlib.sha256(date_of_birth.strip().encode()).hexdigest(),
+    )
+
+
+async def _async_fetch_booking(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    booking_reference: str,
+    date_of_birth: str,
+    surname: str,
+    max_attempts: int,
+):
+    """Fetch a booking, retrying transient failures with backoff."""
+    limiter = async_get_rate_limiter(hass)
+    breaker = async_get_circuit_breaker(hass)
+    metrics = async_get_metrics(hass).booking(booking_reference)
+
+    for attempt in range(1, max_attempts + 1):
+        if not breaker.allow_request():
+            metrics.errors[APIUnavailable.__name__] += 1
+            raise APIUnavailable(
+                f"Jet2 API paused for another {breaker.remaining:.0f}s"
+            )
+
+        probe = breaker.probing
+        try:
+            # Shared by every booking so many entries cannot burst the API.
+            waited = time.monotonic()
+            await limiter.async_acquire()
+            metrics.rate_limit_wait.record(time.monotonic() - waited)
+
+            try:
+                with metrics.request():
+                    body = await _async_request_booking(
+                        session, booking_reference, date_of_birth, surname, metrics
+                    )
+            except APIRatelimitExceeded as err:
+                # The API answered, it is just asking everyone to slow down.
+                breaker.record_success()
+                delay = err.retry_after or backoff_delay(attempt)
+                if attempt == max_attempts or delay > MAX_RETRY_AFTER:
+                    breaker.pause(delay)
+                    raise
+            except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                breaker.record_failure()
+                if attempt == max_attempts:
+                    raise APIUnavailable(f"Jet2 API unavailable: {err!r}") from err
+                delay = backoff_delay(attempt)
+            except (Jet2Error, ValueError):
+                breaker.record_success()
+                raise
+            else:
+                breaker.record_success()
+                return body
+        finally:
+            # A probe cancelled or failing unexpectedly must not leave the
+            # breaker half open with nobody allowed to probe again.
+            if probe:
+                breaker.release_probe()
+
+        await asyncio.sleep(delay)
+
+    raise APIUnavailable("Jet2 API unavailable")
 
 
 class Jet2Error(HomeAssistantError):
@@ -95,6 +411,19 @@ class InvalidAuth(Jet2Error):
 class APIRatelimitExceeded(Jet2Error):
     """Raised when the API rate limit is exceeded."""
 
+    def __init__(self, *args, retry_after: float | None = None) -> None:
+        """Initialize."""
+        super().__init__(*args)
+        self.retry_after = retry_after
+
+
+class APIUnavailable(Jet2Error):
+    """Raised when the API cannot be reached or requests are paused."""
+
+
+class BookingNotFound(Jet2Error):
+    """Raised when the API answers but cannot find the booking."""
+
 
 class UnknownError(Jet2Error):
     """Raised when an unknown error occurs."""
@@ -0,0 +1,74 @@
+"""Diagnostics support for the Jet2 integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_BOOKING_REFERENCE,
+    CONF_DATE_OF_BIRTH,
+    CONF_SURNAME,
+    CONF_SYNCED_EVENTS,
+    DOMAIN,
+)
+from .coordinator import Jet2Coordinator
+from .metrics import async_get_metrics, shared_metrics
+
+TO_REDACT = {
+    CONF_BOOKING_REFERENCE,
+    CONF_DATE_OF_BIRTH,
+    CONF_SURNAME,
+    "title",
+    "unique_id",
+}
+
+
+def entry_state(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the config entry without anything identifying the booking."""
+    state = async_redact_data(entry.as_dict(), TO_REDACT)
+    # Synced event ids carry the booking reference, only count them.
+    if synced := entry.data.get(CONF_SYNCED_EVENTS):
+        state["data"][CONF_SYNCED_EVENTS] = {
+            calendar: len(events) for calendar, events in synced.items()
+        }
+    return state
+
+
+def coordinator_state(coordinator: Jet2Coordinator | None) -> dict[str, Any] | None:
+    """Return how a booking's coordinator is polling."""
+    if coordinator is None:
+        return None
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "last_exception": repr(coordinator.last_exception),
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "platforms": sorted(coordinator.platforms),
+    }
+
+
+def entry_metrics(
+    hass: HomeAssistant, entry: ConfigEntry, include_entities: bool = True
+) -> dict[str, Any]:
+    """Return the coordinator state and metrics of a booking."""
+    coordinator: Jet2Coordinator | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    metrics = async_get_metrics(hass).booking(entry.data[CONF_BOOKING_REFERENCE])
+    return {
+        "coordinator": coordinator_state(coordinator),
+        "metrics": metrics.as_dict(include_entities),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "entry": entry_state(entry),
+        # Entity ids carry the booking reference, so only totals are shared.
+        **entry_metrics(hass, entry, include_entities=False),
+        **shared_metrics(hass),
+    }
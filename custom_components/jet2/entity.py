@@ -0,0 +1,82 @@
+"""Entity helpers shared by the Jet2 platforms."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import Jet2Coordinator
+
+
+class Jet2Entity(CoordinatorEntity[Jet2Coordinator]):
+    """An entity of one booking."""
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counting writes for diagnostics."""
+        self.coordinator.metrics.entity_writes[self.entity_id] += 1
+        super().async_write_ha_state()
+
+
+@callback
+def async_when_found(
+    entry: ConfigEntry, coordinator: Jet2Coordinator, add: Callable[[], None]
+) -> None:
+    """Call add now, or once the booking is first fetched successfully."""
+    if coordinator.booking.success:
+        add()
+        return
+
+    unsub: Callable[[], None] | None = None
+
+    @callback
+    def _async_check() -> None:
+        """Add the entities as soon as there is a booking to show."""
+        nonlocal unsub
+        if unsub is not None and coordinator.booking.success:
+            unsub()
+            unsub = None
+            add()
+
+    @callback
+    def _async_stop() -> None:
+        """Stop waiting for the booking."""
+        if unsub is not None:
+            unsub()
+
+    unsub = coordinator.async_add_listener(_async_check)
+    entry.async_on_unload(_async_stop)
+
+
+@callback
+def async_add_domain_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    key: str,
+    async_add_entities: AddEntitiesCallback,
+    factory: Callable[[], list[Entity]],
+) -> None:
+    """Add entities covering every booking from one entry at a time.
+
+    Every entry asking for them offers to host them. Only the first adds
+    them, and when it unloads the next one takes over.
+    """
+    hosts: dict[str, AddEntitiesCallback] = hass.data.setdefault(key, {})
+    hosts[entry.entry_id] = async_add_entities
+    if len(hosts) == 1:
+        async_add_entities(factory())
+
+    @callback
+    def _async_hand_over() -> None:
+        """Let the next entry host the entities."""
+        was_host = next(iter(hosts)) == entry.entry_id
+        del hosts[entry.entry_id]
+        if was_host and hosts:
+            next(iter(hosts.values()))(factory())
+
+    entry.async_on_unload(_async_hand_over)
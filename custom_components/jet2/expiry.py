@@ -0,0 +1,136 @@
+"""Remove Jet2 bookings when they expire."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .archive import async_get_archive
+from .const import CONF_BOOKING_REFERENCE, DOMAIN
+from .coordinator import Jet2Coordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bookings are removed this long before the API stops returning them.
+EXPIRY_LEAD = timedelta(hours=1)
+
+
+def hasBookingExpired(expiry_date: datetime | None) -> bool:
+    """Check if booking has expired."""
+    if expiry_date is None:
+        return False
+
+    return expiry_date - EXPIRY_LEAD <= dt_util.now()
+
+
+async def removeBooking(hass: HomeAssistant, booking_reference: str):
+    """Remove expired booking."""
+
+    entry = next(
+        (
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.data.get(CONF_BOOKING_REFERENCE) == booking_reference
+        ),
+        None,
+    )
+
+    if entry is None:
+        return
+
+    # Remove the config entry
+    await hass.config_entries.async_remove(entry.entry_id)
+
+
+class ExpiryTimer:
+    """Fire once at a booking's expiry, following changes to the date."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, coordinator: Jet2Coordinator
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self._expiry: datetime | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._expired = False
+
+    @callback
+    def async_schedule(self) -> None:
+        """Set the timer from the latest expiry date."""
+        expiry = self.coordinator.booking.expiry
+        if self._expired or (expiry == self._expiry and self._unsub_timer):
+            return
+
+        self._cancel_timer()
+        self._expiry = expiry
+        if expiry is None:
+            return
+
+        if hasBookingExpired(expiry):
+            self._async_expire(dt_util.now())
+        else:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._async_expire, expiry - EXPIRY_LEAD
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the booking."""
+        self._cancel_timer()
+
+    @callback
+    def _cancel_timer(self) -> None:
+        """Cancel a pending timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_expire(self, _now: datetime) -> None:
+        """Stop polling the booking and remove it."""
+        self._unsub_timer = None
+        self._expired = True
+        booking_reference = self.entry.data[CONF_BOOKING_REFERENCE]
+        _LOGGER.info("Jet2 booking %s has expired, removing it", booking_reference)
+        # Not an entry task, removing the entry unloads it and would cancel it.
+        self.hass.async_create_task(self._async_remove(booking_reference))
+
+    async def _async_remove(self, booking_reference: str) -> None:
+        """Shut the coordinator down, archive the trip, then remove the entry."""
+        await self.coordinator.async_shutdown()
+        booking = self.coordinator.booking
+        if booking.success:
+            try:
+                await async_get_archive(self.hass).async_archive(
+                    booking, dt_util.utcnow().isoformat()
+                )
+            except sqlite3.Error as err:
+                _LOGGER.error(
+                    "Unable to archive Jet2 booking %s: %s", booking_reference, err
+                )
+        await removeBooking(self.hass, booking_reference)
+
+
+@callback
+def async_track_expiry(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: Jet2Coordinator
+) -> CALLBACK_TYPE:
+    """Remove a booking when it expires, returning a function to stop."""
+    timer = ExpiryTimer(hass, entry, coordinator)
+    unsub_listener = coordinator.async_add_listener(timer.async_schedule)
+    timer.async_schedule()
+
+    @callback
+    def _async_stop() -> None:
+        unsub_listener()
+        timer.async_stop()
+
+    return _async_stop
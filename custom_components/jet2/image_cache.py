@@ -0,0 +1,470 @@
+"""Two tier (memory and disk) cache for Jet2 accommodation images."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+import hashlib
+import io
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_IMAGE_CACHE,
+    IMAGE_CACHE_DIR,
+    IMAGE_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .metrics import async_get_metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+MAX_DISK_BYTES = 256 * 1024 * 1024
+PREFETCH_CONCURRENCY = 8
+INDEX_SAVE_DELAY = 60
+# Serve cached bytes without asking upstream for this long, then revalidate.
+FRESHNESS_SECONDS = 3600
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Requested sizes are rounded up to this step so dashboards asking for
+# slightly different sizes share one cached variant.
+SIZE_STEP = 64
+THUMBNAIL_MAX_SIDE = 640
+THUMBNAIL_QUALITY = 70
+FULL_QUALITY = 85
+
+
+@dataclass
+class CachedImage:
+    """An image body and the validators needed to revalidate it."""
+
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+def _snap(size: int | None) -> int | None:
+    """Round a requested dimension up to the next size step."""
+    if not size or size <= 0:
+        return None
+    return math.ceil(size / SIZE_STEP) * SIZE_STEP
+
+
+def scale_image(content: bytes, width: int | None, height: int | None) -> bytes:
+    """Downscale an image to fit within width x height and encode as JPEG.
+
+    Runs in the executor. Returns the original bytes when Pillow is not
+    available, the image cannot be decoded or is already small enough.
+    """
+    try:
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return content
+
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            bound = (width or image.width, height or image.height)
+            if image.width <= bound[0] and image.height <= bound[1]:
+                return content
+
+            image.thumbnail(bound)
+            quality = (
+                THUMBNAIL_QUALITY
+                if max(image.size) <= THUMBNAIL_MAX_SIDE
+                else FULL_QUALITY
+            )
+            output = io.BytesIO()
+            image.convert("RGB").save(
+                output, format="JPEG", quality=quality, optimize=True
+            )
+            return output.getvalue()
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Unable to scale image: %s", err)
+        return content
+
+
+def _write_file(path: str, content: bytes) -> None:
+    """Atomically write a cache file unless it already exists."""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+
+
+def _open_directory(name: str, legacy_directory: str) -> tuple[str, set[str]]:
+    """Return the cache directory and its files, removing the old .storage one."""
+    shutil.rmtree(legacy_directory, ignore_errors=True)
+    directory = os.path.join(tempfile.gettempdir(), name)
+    try:
+        return directory, set(os.listdir(directory))
+    except OSError:
+        return directory, set()
+
+
+def _read_file(path: str) -> bytes | None:
+    """Read a cache file, if it is still there."""
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _remove_files(paths: list[str]) -> None:
+    """Delete evicted cache files."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class Jet2DiskImageStore:
+    """Content-addressed image files with a URL index.
+
+    Files are named after the SHA-256 of their content, so the same photo
+    used by several bookings at one hotel is only stored once. They live in
+    the temporary directory rather than the config directory so backups do
+    not carry them; losing them only means downloading again.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_bytes: int = MAX_DISK_BYTES) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.max_bytes = max_bytes
+        # One directory per config directory, several instances may share a host.
+        instance = hashlib.sha256(hass.config.config_dir.encode()).hexdigest()[:12]
+        self.directory_name = f"{IMAGE_CACHE_DIR}_{instance}"
+        self.directory = ""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, IMAGE_STORAGE_KEY
+        )
+        self._index: dict[str, dict[str, Any]] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load the URL index, only once however often it is called."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the index file, forgetting images whose files are gone."""
+        self.directory, files = await self.hass.async_add_executor_job(
+            _open_directory,
+            self.directory_name,
+            self.hass.config.path(".storage", IMAGE_CACHE_DIR),
+        )
+        if (data := await self._store.async_load()) is not None:
+            images = data.get("images", {})
+            self._index = {
+                url: entry for url, entry in images.items() if entry["hash"] in files
+            }
+            if len(self._index) < len(images):
+                self._schedule_save()
+
+    def _path(self, digest: str) -> str:
+        """Return the file path for a content hash."""
+        return os.path.join(self.directory, digest)
+
+    def _schedule_save(self) -> None:
+        """Save the index soon."""
+        self._store.async_delay_save(lambda: {"images": self._index}, INDEX_SAVE_DELAY)
+
+    async def async_get(self, url: str) -> CachedImage | None:
+        """Return the stored image for url."""
+        await self.async_load()
+        if (entry := self._index.get(url)) is None:
+            return None
+
+        content = await self.hass.async_add_executor_job(
+            _read_file, self._path(entry["hash"])
+        )
+        if content is None:
+            self._index.pop(url, None)
+            self._schedule_save()
+            return None
+
+        entry["used_at"] = time.time()
+        self._schedule_save()
+        return CachedImage(
+            content, entry.get("etag"), entry.get("last_modified"), entry["fetched_at"]
+        )
+
+    def is_fresh(self, url: str, freshness: float) -> bool:
+        """Return True if url is stored and does not need revalidating."""
+        entry = self._index.get(url)
+        return entry is not None and time.time() - entry["fetched_at"] < freshness
+
+    def touch(self, url: str, fetched_at: float) -> None:
+        """Record a successful revalidation."""
+        if (entry := self._index.get(url)) is not None:
+            entry["fetched_at"] = fetched_at
+            self._schedule_save()
+
+    async def async_put(self, url: str, image: CachedImage) -> None:
+        """Store an image and evict the least recently used ones."""
+        await self.async_load()
+        digest = hashlib.sha256(image.content).hexdigest()
+        await self.hass.async_add_executor_job(
+            _write_file, self._path(digest), image.content
+        )
+
+        previous = self._index.get(url)
+        self._index[url] = {
+            "hash": digest,
+            "size": len(image.content),
+            "etag": image.etag,
+            "last_modified": image.last_modified,
+            "fetched_at": image.fetched_at,
+            "used_at": time.time(),
+        }
+
+        orphaned = set()
+        if previous is not None and previous["hash"] != digest:
+            orphaned.add(previous["hash"])
+        orphaned.update(self._evict())
+        self._schedule_save()
+
+        referenced = {entry["hash"] for entry in self._index.values()}
+        if orphaned := orphaned - referenced:
+            await self.hass.async_add_executor_job(
+                _remove_files, [self._path(digest) for digest in orphaned]
+            )
+
+    def _evict(self) -> set[str]:
+        """Drop least recently used index entries until within budget."""
+        sizes = {entry["hash"]: entry["size"] for entry in self._index.values()}
+        references = Counter(entry["hash"] for entry in self._index.values())
+        total = sum(sizes.values())
+        evicted: set[str] = set()
+
+        for url, entry in sorted(
+            self._index.items(), key=lambda item: item[1]["used_at"]
+        ):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            references[entry["hash"]] -= 1
+            if not references[entry["hash"]]:
+                total -= sizes[entry["hash"]]
+                evicted.add(entry["hash"])
+
+        return evicted
+
+
+class Jet2ImageCache:
+    """Byte-size bounded LRU of images keyed by URL and size."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        max_bytes: int = MAX_CACHE_BYTES,
+        freshness: float = FRESHNESS_SECONDS,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.session = session
+        self.max_bytes = max_bytes
+        self.freshness = freshness
+        self.disk = Jet2DiskImageStore(hass)
+        self._images: OrderedDict[str, CachedImage] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[bytes | None]] = {}
+        self._keep_in_memory: set[str] = set()
+        self._variants: OrderedDict[tuple[str, int | None, int | None], bytes] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self.metrics = async_get_metrics(hass).image_cache
+        # Shared by every booking's prefetch so warming many bookings at once
+        # cannot crowd out booking requests.
+        self._prefetch_semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within budget."""
+        while self._size > self.max_bytes and self._variants:
+            _, evicted = self._variants.popitem(last=False)
+            self._size -= len(evicted)
+        while self._size > self.max_bytes and self._images:
+            _, image = self._images.popitem(last=False)
+            self._size -= len(image.content)
+
+    def _put(self, url: str, image: CachedImage) -> None:
+        """Store an original image, dropping its now outdated variants."""
+        if (previous := self._images.pop(url, None)) is not None:
+            self._size -= len(previous.content)
+            for key in [key for key in self._variants if key[0] == url]:
+                self._size -= len(self._variants.pop(key))
+
+        if len(image.content) > self.max_bytes:
+            return
+
+        self._images[url] = image
+        self._size += len(image.content)
+        self._evict()
+
+    def _put_variant(
+        self, key: tuple[str, int | None, int | None], content: bytes
+    ) -> None:
+        """Store a scaled variant of an original image."""
+        if (previous := self._variants.pop(key, None)) is not None:
+            self._size -= len(previous)
+        if len(content) > self.max_bytes:
+            return
+        self._variants[key] = content
+        self._size += len(content)
+        self._evict()
+
+    async def _async_get_original(
+        self, url: str, keep_in_memory: bool = True
+    ) -> bytes | None:
+        """Return the full size image at url, coalescing concurrent fetches."""
+        if keep_in_memory:
+            # Honoured even when joining a fetch started by a prefetch.
+            self._keep_in_memory.add(url)
+        if (task := self._inflight.get(url)) is None:
+            task = self.hass.async_create_task(self._async_fetch_original(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await task
+
+    async def _async_fetch_original(self, url: str) -> bytes | None:
+        """Fetch url once, keeping it in memory if any caller asked to."""
+        try:
+            image = await self._async_load_original(url)
+        finally:
+            keep_in_memory = url in self._keep_in_memory
+            self._keep_in_memory.discard(url)
+
+        if image is None:
+            return None
+        if (current := self._images.get(url)) is not image and (
+            keep_in_memory or current is not None
+        ):
+            self._put(url, image)
+        return image.content
+
+    async def _async_load_original(self, url: str) -> CachedImage | None:
+        """Return the full size image from memory, disk or upstream."""
+        if (cached := self._images.get(url)) is not None:
+            self._images.move_to_end(url)
+            self.metrics["memory_hits"] += 1
+        elif (cached := await self.disk.async_get(url)) is not None:
+            self.metrics["disk_hits"] += 1
+        else:
+            self.metrics["misses"] += 1
+
+        now = time.time()
+        if cached is not None and now - cached.fetched_at < self.freshness:
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            async with self.session.get(
+                url, headers=headers, timeout=REQUEST_TIMEOUT
+            ) as resp:
+                if resp.status == 304 and cached is not None:
+                    self.metrics["revalidated"] += 1
+                    cached.fetched_at = now
+                    self.disk.touch(url, now)
+                    return cached
+
+                resp.raise_for_status()
+                content = await resp.read()
+                self.metrics["downloads"] += 1
+                self.metrics["bytes_downloaded"] += len(content)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Unable to fetch image %s: %s", url, err)
+            self.metrics["errors"] += 1
+            # A stale image is better than a broken camera.
+            return cached
+
+        image = CachedImage(content, etag, last_modified, now)
+        await self.disk.async_put(url, image)
+        return image
+
+    async def async_prefetch(self, urls: Iterable[str]) -> None:
+        """Warm the disk cache with every image a booking will show."""
+        await self.disk.async_load()
+
+        async def _prefetch(url: str) -> None:
+            async with self._prefetch_semaphore:
+                if not self.disk.is_fresh(url, self.freshness):
+                    await self._async_get_original(url, keep_in_memory=False)
+
+        await asyncio.gather(
+            *(
+                _prefetch(url)
+                for url in dict.fromkeys(urls)
+                if not self.disk.is_fresh(url, self.freshness)
+            )
+        )
+
+    async def async_get(
+        self, url: str, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the image at url scaled to fit width x height."""
+        original = await self._async_get_original(url)
+        width, height = _snap(width), _snap(height)
+
+        if original is None or (width is None and height is None):
+            return original
+
+        key = (url, width, height)
+        if (variant := self._variants.get(key)) is not None:
+            self._variants.move_to_end(key)
+            self.metrics["variant_hits"] += 1
+            return variant
+
+        self.metrics["variant_misses"] += 1
+
+        variant = await self.hass.async_add_executor_job(
+            scale_image, original, width, height
+        )
+        # Skip caching when nothing was scaled or the original was replaced
+        # while scaling.
+        current = self._images.get(url)
+        if (
+            variant is not original
+            and current is not None
+            and current.content is original
+        ):
+            self._put_variant(key, variant)
+        return variant
+
+
+def async_get_image_cache(hass: HomeAssistant) -> Jet2ImageCache:
+    """Return the domain-wide image cache."""
+    if (cache := hass.data.get(DATA_IMAGE_CACHE)) is None:
+        cache = hass.data[DATA_IMAGE_CACHE] = Jet2ImageCache(
+            hass, async_get_clientsession(hass)
+        )
+    return cache
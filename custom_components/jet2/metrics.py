@@ -0,0 +1,276 @@
+"""Runtime counters for tuning Jet2 polling and rate limits."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_METRICS
+from .throttle import async_get_circuit_breaker, async_get_rate_limiter
+
+# Recent samples kept per timing, old ones are dropped as new ones arrive.
+MAX_SAMPLES = 100
+
+# Requests, from every booking, the API health sensors are computed over,
+# counted in buckets so the window costs the same at any request rate.
+HEALTH_WINDOW = 3600
+HEALTH_BUCKET = 60
+
+# Request times are counted in bins about 19% wide, so percentiles are never
+# more than one bin above the exact value.
+LATENCY_BIN_MIN = 0.001
+LATENCY_BIN_GROWTH = 2**0.25
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Timings:
+    """The most recent durations of something, summarised as percentiles."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES) -> None:
+        """Initialize."""
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a duration."""
+        self.count += 1
+        self._samples.append(seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the count and percentiles in milliseconds."""
+        if not self._samples:
+            return {"count": self.count}
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+
+def latency_bin(seconds: float) -> int:
+    """Return the bin a request time is counted in."""
+    if seconds <= LATENCY_BIN_MIN:
+        return 0
+    return math.ceil(math.log(seconds / LATENCY_BIN_MIN, LATENCY_BIN_GROWTH))
+
+
+class HealthBucket:
+    """Requests made during one slice of the health window."""
+
+    __slots__ = ("start", "requests", "successes", "latencies")
+
+    def __init__(self, start: float) -> None:
+        """Initialize."""
+        self.start = start
+        self.requests = 0
+        self.successes = 0
+        self.latencies: Counter[int] = Counter()
+
+
+class ApiHealth:
+    """Sliding window of recent API requests from every booking.
+
+    Requests are counted into fixed buckets and totals are adjusted as
+    buckets enter and leave the window, so counts are exact, memory is
+    bounded and reading them never walks every request.
+    """
+
+    def __init__(
+        self, window: float = HEALTH_WINDOW, bucket_seconds: float = HEALTH_BUCKET
+    ) -> None:
+        """Initialize."""
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.last_success: datetime | None = None
+        self._buckets: deque[HealthBucket] = deque()
+        self._requests = 0
+        self._successes = 0
+        self._latencies: Counter[int] = Counter()
+
+    def record(self, seconds: float, success: bool) -> None:
+        """Add a request that took seconds and succeeded or failed."""
+        now = time.monotonic()
+        self._expire(now)
+        start = now - now % self.bucket_seconds
+        if not self._buckets or self._buckets[-1].start != start:
+            self._buckets.append(HealthBucket(start))
+        bucket = self._buckets[-1]
+        latency = latency_bin(seconds)
+        bucket.requests += 1
+        bucket.successes += success
+        bucket.latencies[latency] += 1
+        self._requests += 1
+        self._successes += success
+        self._latencies[latency] += 1
+
+    def record_refresh(self) -> None:
+        """Note a booking refreshed successfully."""
+        self.last_success = dt_util.utcnow()
+
+    def _expire(self, now: float) -> None:
+        """Drop buckets that left the window."""
+        while self._buckets and self._buckets[0].start <= now - self.window:
+            bucket = self._buckets.popleft()
+            self._requests -= bucket.requests
+            self._successes -= bucket.successes
+            self._latencies.subtract(bucket.latencies)
+            self._latencies = +self._latencies
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests in the window."""
+        self._expire(time.monotonic())
+        return self._requests
+
+    @property
+    def success_ratio(self) -> float | None:
+        """Return the share of requests in the window that succeeded."""
+        if not (requests := self.requests):
+            return None
+        return self._successes / requests
+
+    @property
+    def latency_p95(self) -> float | None:
+        """Return the 95th percentile request time in seconds."""
+        if not (requests := self.requests):
+            return None
+        rank = min(requests - 1, int(0.95 * requests))
+        for latency, count in sorted(self._latencies.items()):
+            if (rank := rank - count) < 0:
+                break
+        return LATENCY_BIN_MIN * LATENCY_BIN_GROWTH**latency
+
+
+def hit_rate(hits: int, misses: int) -> float | None:
+    """Return the share of lookups that hit, None before any lookup."""
+    if not hits + misses:
+        return None
+    return round(hits / (hits + misses), 3)
+
+
+class BookingMetrics:
+    """Counters for the requests and updates of one booking."""
+
+    def __init__(self, api_health: ApiHealth | None = None) -> None:
+        """Initialize."""
+        self.api_health = api_health or ApiHealth()
+        self.requests = 0
+        self.bytes_received = 0
+        self.errors: Counter[str] = Counter()
+        self.request_latency = Timings()
+        self.rate_limit_wait = Timings()
+        self.update_duration = Timings()
+        # Fetches answered by a request another caller already had in flight.
+        self.shared_fetches = 0
+        self.responses_changed = 0
+        self.responses_unchanged = 0
+        self.entity_writes: Counter[str] = Counter()
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """Time one request to the API, counting it and any error it raises."""
+        self.requests += 1
+        started = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        except Exception as err:
+            self.errors[type(err).__name__] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.request_latency.record(elapsed)
+            self.api_health.record(elapsed, success)
+
+    def as_dict(self, include_entities: bool = True) -> dict[str, Any]:
+        """Return the metrics as plain data."""
+        metrics = {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "errors": dict(self.errors),
+            "request_latency": self.request_latency.as_dict(),
+            "rate_limit_wait": self.rate_limit_wait.as_dict(),
+            "update_duration": self.update_duration.as_dict(),
+            "shared_fetches": self.shared_fetches,
+            "unchanged_response_rate": hit_rate(
+                self.responses_unchanged, self.responses_changed
+            ),
+            "entity_writes": sum(self.entity_writes.values()),
+        }
+        if include_entities:
+            metrics["entity_writes_by_entity"] = dict(self.entity_writes)
+        return metrics
+
+
+class Jet2Metrics:
+    """Metrics for every booking and the shared image cache."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._bookings: dict[str, BookingMetrics] = {}
+        self.api_health = ApiHealth()
+        self.image_cache: Counter[str] = Counter()
+
+    def booking(self, booking_reference: str) -> BookingMetrics:
+        """Return the metrics of a booking, starting them if needed."""
+        key = booking_reference.strip().upper()
+        if (metrics := self._bookings.get(key)) is None:
+            metrics = self._bookings[key] = BookingMetrics(self.api_health)
+        return metrics
+
+    def forget(self, booking_reference: str) -> None:
+        """Drop the metrics of a booking that was removed."""
+        self._bookings.pop(booking_reference.strip().upper(), None)
+
+    def image_cache_as_dict(self) -> dict[str, Any]:
+        """Return the image cache counters and hit rates."""
+        counts = self.image_cache
+        return {
+            **counts,
+            "memory_hit_rate": hit_rate(
+                counts["memory_hits"], counts["disk_hits"] + counts["misses"]
+            ),
+            "hit_rate": hit_rate(
+                counts["memory_hits"] + counts["disk_hits"], counts["misses"]
+            ),
+            "variant_hit_rate": hit_rate(
+                counts["variant_hits"], counts["variant_misses"]
+            ),
+        }
+
+
+def async_get_metrics(hass: HomeAssistant) -> Jet2Metrics:
+    """Return the domain-wide metrics."""
+    if (metrics := hass.data.get(DATA_METRICS)) is None:
+        metrics = hass.data[DATA_METRICS] = Jet2Metrics()
+    return metrics
+
+
+def shared_metrics(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the state of what every booking shares."""
+    breaker = async_get_circuit_breaker(hass)
+    limiter = async_get_rate_limiter(hass)
+    return {
+        "image_cache": async_get_metrics(hass).image_cache_as_dict(),
+        "circuit_breaker": {
+            "failures": breaker.failures,
+            "paused_for": round(breaker.remaining, 1),
+        },
+        "rate_limit": {"rate": limiter.rate, "burst": limiter.capacity},
+    }
@@ -0,0 +1,153 @@
+"""Parsed Jet2 booking shared by every platform."""
+
+from __future__ import annotations
+
+from datetime import datetime, tzinfo
+from typing import Any
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def parse_booking_date(value: Any, time_zone: tzinfo) -> datetime | None:
+    """Parse a Jet2 local date string into an aware datetime."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.strptime(value, DATE_FORMAT).replace(tzinfo=time_zone)
+    except ValueError:
+        return None
+
+
+def _check_in_state(check_in_status: Any) -> str | None:
+    """Return the human readable check-in state."""
+    if not isinstance(check_in_status, dict):
+        return None
+    if "checkInAllowed" not in check_in_status:
+        return None
+    if not check_in_status["checkInAllowed"]:
+        return "Not Allowed"
+
+    state = "Allowed"
+    for flight in ("outboundFlight", "inboundFlight"):
+        details = check_in_status.get(flight)
+        if details is not None and "checkedInCode" in details:
+            state = details["checkedInCode"]
+    return state
+
+
+def entity_attributes(value: Any) -> dict[str, Any]:
+    """Flatten a booking value into entity attributes.
+
+    Built afresh on every update, so keys from items a list no longer has
+    do not linger.
+    """
+    if isinstance(value, dict):
+        return dict(value)
+
+    attrs: dict[str, Any] = {}
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, dict):
+                for attr, attr_value in item.items():
+                    attrs[str(attr) + str(index)] = attr_value
+            else:
+                attrs[str(index)] = item
+    return attrs
+
+
+class Jet2Booking:
+    """A booking response, parsed once per refresh."""
+
+    __slots__ = (
+        "success",
+        "data",
+        "reference",
+        "holiday_type",
+        "outbound_departure",
+        "inbound_departure",
+        "inbound_arrival",
+        "outbound",
+        "inbound",
+        "check_in_opens",
+        "check_in_date",
+        "check_in_allowed",
+        "check_in_state",
+        "payment_due",
+        "paid_in_full",
+        "expiry",
+        "passenger_total",
+        "location_name",
+        "location",
+        "image_urls",
+    )
+
+    def __init__(self, body: dict | None, time_zone: tzinfo) -> None:
+        """Parse a response body."""
+        body = body if isinstance(body, dict) else {}
+        data = body.get("data")
+        data = data if isinstance(data, dict) else {}
+
+        self.success: bool = bool(body.get("success"))
+        self.data: dict[str, Any] = data
+        self.reference: str | None = data.get("bookingReference")
+        self.holiday_type: str | None = data.get("holidayType")
+
+        flight_summary = data.get("flightSummary") or {}
+        outbound = flight_summary.get("outbound") or {}
+        inbound = flight_summary.get("inbound") or {}
+        self.outbound_departure = parse_booking_date(
+            outbound.get("localDepartureDateTime"), time_zone
+        )
+        self.inbound_departure = parse_booking_date(
+            inbound.get("localDepartureDateTime"), time_zone
+        )
+        self.inbound_arrival = parse_booking_date(
+            inbound.get("localArrivalDateTime"), time_zone
+        )
+        self.outbound = parse_booking_date(data.get("outbound"), time_zone)
+        self.inbound = parse_booking_date(data.get("inbound"), time_zone)
+
+        check_in_status = data.get("checkInStatus")
+        if isinstance(check_in_status, dict):
+            # The check-in open sensor has always shown the first value.
+            self.check_in_opens = parse_booking_date(
+                next(iter(check_in_status.values()), None), time_zone
+            )
+            self.check_in_date = parse_booking_date(
+                check_in_status.get("checkInDate"), time_zone
+            )
+            self.check_in_allowed = bool(check_in_status.get("checkInAllowed"))
+        else:
+            self.check_in_opens = None
+            self.check_in_date = None
+            self.check_in_allowed = False
+        self.check_in_state = _check_in_state(check_in_status)
+
+        price_breakdown = data.get("priceBreakdown") or {}
+        self.payment_due = parse_booking_date(
+            price_breakdown.get("paymentDateDue"), time_zone
+        )
+        self.paid_in_full = bool(price_breakdown.get("paidInFull"))
+        self.expiry = parse_booking_date(data.get("expiryDate"), time_zone)
+
+        passengers = data.get("numberOfPassengers")
+        self.passenger_total = (
+            sum(passengers.values()) if isinstance(passengers, dict) else None
+        )
+
+        # Most specific first, anything null or of the wrong shape is skipped.
+        hotel = data.get("hotel")
+        places = [
+            place
+            for place in (
+                hotel.get("name") if isinstance(hotel, dict) else None,
+                data.get("resort"),
+                data.get("area"),
+                data.get("region"),
+            )
+            if isinstance(place, str)
+        ]
+        self.location_name = places[0] if places else None
+        self.location = ", ".join(places) if len(places) == 4 else self.location_name
+
+        self.image_urls: tuple[str, ...] = tuple(data.get("accommodationImages") or ())
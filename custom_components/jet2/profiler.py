@@ -0,0 +1,254 @@
+"""On-demand profiling of the Jet2 integration's own call paths."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+import contextvars
+import cProfile
+from dataclasses import dataclass, field
+import functools
+import inspect
+import logging
+import sys
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROFILER
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_STACKS = "stacks"
+FORMAT_CPROFILE = "cprofile"
+PROFILE_FORMATS = (FORMAT_STACKS, FORMAT_CPROFILE)
+
+# Functions timed by the stacks profiler, by the module of this package
+# defining them. Only modules already loaded are patched and nothing is
+# wrapped until a profile starts, so there is no cost while profiling is off.
+PROFILE_TARGETS = {
+    "coordinator": (
+        "Jet2Coordinator._async_update_data",
+        "_async_fetch_booking",
+        "_async_request_booking",
+        "fingerprint_response",
+        "diff_keys",
+    ),
+    "scheduler": ("plan_update_interval", "retry_interval", "first_interval"),
+    "model": ("Jet2Booking.__init__",),
+    "sensor": ("Jet2Sensor.update_from_coordinator",),
+    "binary_sensor": ("Jet2BinarySensor.update_from_coordinator",),
+    "calendar": (
+        "booking_events",
+        "EventIndex.__init__",
+        "EventIndex.between",
+        "EventIndex.add",
+        "EventIndex.remove",
+        "Jet2CalendarSensor.async_get_events",
+        "Jet2AllHolidaysCalendar.async_get_events",
+    ),
+    "calendar_sync": ("async_sync_calendars",),
+    "image_cache": (
+        "Jet2ImageCache.async_get",
+        "Jet2ImageCache.async_prefetch",
+    ),
+}
+
+
+@dataclass
+class _Frame:
+    """A timed call and the time spent in the timed calls it made."""
+
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    children: float = 0.0
+
+
+_frames: contextvars.ContextVar[tuple[_Frame, ...]] = contextvars.ContextVar(
+    "jet2_profile_frames", default=()
+)
+
+
+class StackTracer:
+    """Wall-clock time of wrapped functions, by call stack."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.self_time: Counter[str] = Counter()
+        self.calls: Counter[str] = Counter()
+
+    def _enter(self, name: str) -> tuple[_Frame, contextvars.Token]:
+        """Start timing a call."""
+        frames = _frames.get()
+        path = f"{frames[-1].path};{name}" if frames else name
+        frame = _Frame(path)
+        return frame, _frames.set((*frames, frame))
+
+    def _exit(self, frame: _Frame, token: contextvars.Token) -> None:
+        """Stop timing a call, charging its time to its caller."""
+        _frames.reset(token)
+        elapsed = time.perf_counter() - frame.started
+        # Tasks started by the call may still be running, never go negative.
+        self.self_time[frame.path] += max(0.0, elapsed - frame.children)
+        self.calls[frame.path] += 1
+        if frames := _frames.get():
+            frames[-1].children += elapsed
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return func timed under name."""
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                frame, token = self._enter(name)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._exit(frame, token)
+
+            return _async_wrapper
+
+        @functools.wraps(func)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            frame, token = self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(frame, token)
+
+        return _wrapper
+
+    def collapsed(self) -> str:
+        """Return the stacks in collapsed format, in microseconds."""
+        return "".join(
+            f"{path} {round(seconds * 1_000_000)}\n"
+            for path, seconds in sorted(self.self_time.items())
+        )
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Return the calls that took the most time themselves."""
+        return [
+            {
+                "stack": path,
+                "calls": self.calls[path],
+                "self_ms": round(seconds * 1000, 3),
+            }
+            for path, seconds in self.self_time.most_common(20)
+        ]
+
+
+def _resolve(module_name: str, qualname: str) -> tuple[Any, str, Any] | None:
+    """Return the owner, attribute and stored value of a loaded target."""
+    if (owner := sys.modules.get(f"{__package__}.{module_name}")) is None:
+        return None
+    *parents, attribute = qualname.split(".")
+    for parent in parents:
+        if (owner := getattr(owner, parent, None)) is None:
+            return None
+    try:
+        return owner, attribute, inspect.getattr_static(owner, attribute)
+    except AttributeError:
+        return None
+
+
+def _targets(module_name: str, qualname: str) -> list[tuple[Any, str, Any]]:
+    """Return every place a loaded target is stored.
+
+    Modules importing a function by name call their own reference to it, so
+    those references are patched as well.
+    """
+    if (target := _resolve(module_name, qualname)) is None:
+        return []
+    owner, _, original = target
+    if not inspect.ismodule(owner):
+        return [target]
+    return [
+        (module, attribute, original)
+        for name, module in list(sys.modules.items())
+        if name.startswith(f"{__package__}.") and module is not None
+        for attribute, value in list(vars(module).items())
+        if value is original
+    ]
+
+
+class Jet2Profiler:
+    """Run one profile at a time."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._lock = asyncio.Lock()
+
+    async def async_profile(self, seconds: float, profile_format: str) -> dict:
+        """Profile for the given time and write the report to the config dir."""
+        if self._lock.locked():
+            raise HomeAssistantError("A Jet2 profile is already running")
+
+        async with self._lock:
+            stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+            if profile_format == FORMAT_CPROFILE:
+                path = self.hass.config.path(f"jet2_profile_{stamp}.prof")
+                result = await self._async_cprofile(seconds, path)
+            else:
+                path = self.hass.config.path(f"jet2_profile_{stamp}.folded")
+                result = await self._async_trace_stacks(seconds, path)
+
+        _LOGGER.info("Jet2 profile written to %s", path)
+        return {"path": path, **result}
+
+    async def _async_cprofile(self, seconds: float, path: str) -> dict:
+        """Profile everything running on the event loop."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Unable to start profiling: {err}") from err
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+        await self.hass.async_add_executor_job(profile.dump_stats, path)
+        return {}
+
+    async def _async_trace_stacks(self, seconds: float, path: str) -> dict:
+        """Time the integration's own call paths."""
+        tracer = StackTracer()
+        patched = []
+        for module_name, qualnames in PROFILE_TARGETS.items():
+            for qualname in qualnames:
+                if not (targets := _targets(module_name, qualname)):
+                    continue
+                original = targets[0][2]
+                if isinstance(original, (staticmethod, classmethod)):
+                    wrapped = type(original)(tracer.wrap(qualname, original.__func__))
+                else:
+                    wrapped = tracer.wrap(qualname, original)
+                for owner, attribute, _ in targets:
+                    setattr(owner, attribute, wrapped)
+                    patched.append((owner, attribute, original))
+
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            for owner, attribute, original in reversed(patched):
+                setattr(owner, attribute, original)
+
+        await self.hass.async_add_executor_job(_write_text, path, tracer.collapsed())
+        return {"top": tracer.summary()}
+
+
+def _write_text(path: str, text: str) -> None:
+    """Write a report."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def async_get_profiler(hass: HomeAssistant) -> Jet2Profiler:
+    """Return the domain-wide profiler."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is None:
+        profiler = hass.data[DATA_PROFILER] = Jet2Profiler(hass)
+    return profiler
@@ -0,0 +1,107 @@
+"""Itinerary-driven polling schedule for Jet2 bookings."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+
+from .model import Jet2Booking
+
+MIN_UPDATE_INTERVAL = timedelta(minutes=5)
+MAX_UPDATE_INTERVAL = timedelta(hours=12)
+
+# (window before a milestone, polling interval inside that window)
+FLIGHT_WINDOWS = [
+    (timedelta(hours=6), timedelta(minutes=5)),
+    (timedelta(days=2), timedelta(minutes=15)),
+    (timedelta(days=7), timedelta(hours=1)),
+    (timedelta(days=30), timedelta(hours=4)),
+]
+CHECK_IN_WINDOWS = [
+    (timedelta(hours=1), timedelta(minutes=5)),
+    (timedelta(days=1), timedelta(minutes=30)),
+]
+PAYMENT_WINDOWS = [
+    (timedelta(days=1), timedelta(minutes=30)),
+    (timedelta(days=7), timedelta(hours=3)),
+]
+
+# Each interval is stretched by a random share of itself so bookings set up
+# together drift apart instead of polling in lock-step.
+STAGGER_FRACTION = 0.1
+
+# Failed refreshes are retried soon, backing off up to this while they last.
+MAX_RETRY_INTERVAL = timedelta(hours=1)
+
+# How long after a flight departs or lands it is still worth polling quickly.
+FLIGHT_GRACE = timedelta(hours=3)
+
+
+def _interval_for(
+    milestone: datetime | None,
+    now: datetime,
+    windows: list[tuple[timedelta, timedelta]],
+    grace: timedelta = timedelta(0),
+) -> timedelta:
+    """Return the polling interval a single milestone asks for."""
+    if milestone is None or now > milestone + grace:
+        return MAX_UPDATE_INTERVAL
+
+    until = milestone - now
+    for window, interval in windows:
+        if until <= window:
+            return interval
+
+    # Far away: never sleep past the point where the nearest window opens.
+    return min(MAX_UPDATE_INTERVAL, until - windows[-1][0])
+
+
+def plan_update_interval(booking: Jet2Booking, now: datetime) -> timedelta:
+    """Derive the next polling interval from a booking.
+
+    Polls every few minutes around flights and the check-in window, and
+    backs off to hours when nothing is due for weeks.
+    """
+    if not booking.success:
+        return MIN_UPDATE_INTERVAL
+
+    intervals = [
+        MAX_UPDATE_INTERVAL,
+        _interval_for(booking.outbound_departure, now, FLIGHT_WINDOWS, FLIGHT_GRACE),
+        _interval_for(
+            booking.inbound_departure or booking.inbound_arrival,
+            now,
+            FLIGHT_WINDOWS,
+            FLIGHT_GRACE,
+        ),
+        _interval_for(booking.check_in_date, now, CHECK_IN_WINDOWS),
+    ]
+    if not booking.paid_in_full:
+        intervals.append(_interval_for(booking.payment_due, now, PAYMENT_WINDOWS))
+
+    interval = min(intervals)
+
+    # Expiry removes the booking, so there is no point polling beyond it.
+    if booking.expiry is not None and booking.expiry > now:
+        interval = min(interval, booking.expiry - now)
+
+    return max(MIN_UPDATE_INTERVAL, interval)
+
+
+def retry_interval(booking: Jet2Booking, now: datetime, failures: int) -> timedelta:
+    """Return the polling interval after consecutive failed refreshes."""
+    backoff = min(MAX_RETRY_INTERVAL, MIN_UPDATE_INTERVAL * 2 ** min(failures - 1, 8))
+    if not booking.success:
+        # Never fetched, there is no itinerary to keep up with.
+        return backoff
+    return min(plan_update_interval(booking, now), backoff)
+
+
+def first_interval(interval: timedelta) -> timedelta:
+    """Return a random point within an interval for a booking's first poll."""
+    return max(MIN_UPDATE_INTERVAL, interval * random.random())
+
+
+def stagger(interval: timedelta) -> timedelta:
+    """Add random jitter to a polling interval."""
+    return interval * (1 + random.uniform(0, STAGGER_FRACTION))
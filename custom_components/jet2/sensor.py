@@ -1,23 +1,38 @@
 """Jet2 sensor platform."""
 
-from datetime import date, datetime
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import functools
 from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
+from homeassistant.helpers.typing import StateType
 
-from .const import CONF_BOOKING_REFERENCE, DOMAIN
+from .const import (
+    CONF_API_HEALTH_SENSORS,
+    CONF_BOOKING_REFERENCE,
+    DATA_API_HEALTH_HOSTS,
+    DOMAIN,
+)
 from .coordinator import Jet2Coordinator
+from .entity import Jet2Entity, async_add_domain_entities, async_when_found
+from .metrics import ApiHealth, async_get_metrics
+from .model import entity_attributes
+from .throttle import CircuitBreaker, async_get_circuit_breaker
+
+# Only the API health sensors poll, and only to age out old requests.
+SCAN_INTERVAL = timedelta(minutes=1)
 
 SENSOR_TYPES = [
     SensorEntityDescription(
@@ -109,34 +124,76 @@ SENSOR_TYPES = [
 ]
 
 
-def hasBookingExpired(hass: HomeAssistant, expiry_date_raw: str) -> bool:
-    """Check if booking has expired."""
+# Sensors whose state is derived from other keys of the booking.
+SOURCE_KEYS = {
+    "checkInState": ("checkInStatus",),
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class Jet2ApiHealthSensorEntityDescription(SensorEntityDescription):
+    """Describes a Jet2 API health sensor."""
 
-    user_timezone = dt_util.get_time_zone(hass.config.time_zone)
+    value_fn: Callable[[ApiHealth, CircuitBreaker], StateType | datetime]
+    attributes_fn: Callable[[ApiHealth, CircuitBreaker], dict[str, Any]] | None = None
 
-    dt_utc = datetime.strptime(expiry_date_raw, "%Y-%m-%dT%H:%M:%S").replace(
-        tzinfo=user_timezone
-    )
-    # Convert the datetime to the default timezone
-    expiry_date = dt_utc.astimezone(user_timezone)
 
-    return (expiry_date.timestamp() - datetime.today().timestamp()) <= 3600
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
 
 
-async def removeBooking(hass: HomeAssistant, booking_reference: str):
-    """Remove expired booking."""
+def _percentage(ratio: float | None) -> float | None:
+    """Convert a ratio to a percentage."""
+    return None if ratio is None else round(ratio * 100, 1)
 
-    entry = next(
-        (
-            entry
-            for entry in hass.config_entries.async_entries(DOMAIN)
-            if entry.data.get(CONF_BOOKING_REFERENCE) == booking_reference
-        ),
-        None,
-    )
 
-    # Remove the config entry
-    await hass.config_entries.async_remove(entry.entry_id)
+API_HEALTH_SENSOR_TYPES = [
+    Jet2ApiHealthSensorEntityDescription(
+        key="latency_p95",
+        name="Latency p95",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda health, _: _milliseconds(health.latency_p95),
+    ),
+    Jet2ApiHealthSensorEntityDescription(
+        key="success_ratio",
+        name="Success Ratio",
+        icon="mdi:check-network-outline",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda health, _: _percentage(health.success_ratio),
+    ),
+    Jet2ApiHealthSensorEntityDescription(
+        key="requests_last_hour",
+        name="Requests Last Hour",
+        icon="mdi:counter",
+        native_unit_of_measurement="requests",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda health, _: health.requests,
+    ),
+    Jet2ApiHealthSensorEntityDescription(
+        key="backoff",
+        name="Backoff",
+        icon="mdi:car-brake-alert",
+        device_class=SensorDeviceClass.ENUM,
+        options=["ok", "retrying", "paused", "probing"],
+        value_fn=lambda _, breaker: breaker.state,
+        attributes_fn=lambda _, breaker: {
+            "failures": breaker.failures,
+            "paused_for": round(breaker.remaining),
+        },
+    ),
+    Jet2ApiHealthSensorEntityDescription(
+        key="last_successful_refresh",
+        name="Last Successful Refresh",
+        icon="mdi:update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda health, _: health.last_success,
+    ),
+]
 
 
 async def async_setup_entry(
@@ -145,36 +202,36 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
-    config = hass.data[DOMAIN][entry.entry_id]
-
-    if entry.options:
-        config.update(entry.options)
-
-    if entry.data:
-        session = async_get_clientsession(hass)
-
-        coordinator = Jet2Coordinator(hass, session, entry.data)
-
-        await coordinator.async_refresh()
+    coordinator: Jet2Coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    name = entry.data[CONF_BOOKING_REFERENCE]
+
+    if entry.options.get(CONF_API_HEALTH_SENSORS):
+        async_add_domain_entities(
+            hass,
+            entry,
+            DATA_API_HEALTH_HOSTS,
+            functools.partial(async_add_entities, update_before_add=True),
+            lambda: [
+                Jet2ApiHealthSensor(description)
+                for description in API_HEALTH_SENSOR_TYPES
+            ],
+        )
 
-        success = bool(coordinator.data.get("success"))
-        name = entry.data[CONF_BOOKING_REFERENCE]
+    @callback
+    def _async_add_sensors() -> None:
+        """Add a sensor for every key the booking has."""
+        sensors = [
+            Jet2Sensor(coordinator, name, description)
+            for description in SENSOR_TYPES
+            if description.key in coordinator.data
+        ]
+        async_add_entities(sensors)
 
-        if success:
-            if hasBookingExpired(hass, coordinator.data.get("data")["expiryDate"]):
-                await removeBooking(hass, name)
-            else:
-                sensors = [
-                    Jet2Sensor(coordinator, name, description)
-                    for description in SENSOR_TYPES
-                    if description.key in coordinator.data
-                ]
-                async_add_entities(sensors, update_before_add=True)
-        else:
-            await removeBooking(hass, name)
+    async_when_found(entry, coordinator, _async_add_sensors)
 
 
-class Jet2Sensor(CoordinatorEntity[Jet2Coordinator], SensorEntity):
+class Jet2Sensor(Jet2Entity, SensorEntity):
     """Define an Jet2 sensor."""
 
     def __init__(
@@ -203,82 +260,48 @@ class Jet2Sensor(CoordinatorEntity[Jet2Coordinator], SensorEntity):
 
     def update_from_coordinator(self):
         """Update sensor state and attributes from coordinator data."""
-
-        if not self.success:
-            self.hass.async_add_job(removeBooking(self.hass, self.name))
-        else:
-            value = self.data.get(self.entity_description.key)
-
-            if isinstance(value, (dict, list)):
-                for index, attribute in enumerate(value):
-                    if isinstance(attribute, (dict, list)):
-                        for attr in attribute:
-                            self.attrs[str(attr) + str(index)] = attribute[attr]
-                    else:
-                        self.attrs[attribute] = value[attribute]
-
-            if self.entity_description.key == "checkInState":
-                value = self.data.get("checkInStatus")
-                if "checkInAllowed" in value:
-                    if value["checkInAllowed"]:
-                        _value = "Allowed"
-                        if "outboundFlight" in value:
-                            outboundFlight = value["outboundFlight"]
-                            if (
-                                outboundFlight is not None
-                                and "checkedInCode" in outboundFlight
-                            ):
-                                _value = outboundFlight["checkedInCode"]
-                        if "inboundFlight" in value:
-                            inboundFlight = value["inboundFlight"]
-                            if (
-                                inboundFlight is not None
-                                and "checkedInCode" in inboundFlight
-                            ):
-                                _value = inboundFlight["checkedInCode"]
-                    else:
-                        _value = "Not Allowed"
-                value = _value
-
-            if self.entity_description.key == "numberOfPassengers":
-                passenger_count = 0
-                for key in value:
-                    passenger_count += value[key]
-                value = passenger_count
-
-            if isinstance(value, dict):
-                if self.entity_description.key == "flightSummary":
+        if self.success:
+            booking = self.coordinator.booking
+            key = self.entity_description.key
+            value = booking.data.get(key)
+
+            self.attrs = entity_attributes(value)
+
+            if key == "checkInState":
+                value = booking.check_in_state
+            elif key == "numberOfPassengers":
+                value = booking.passenger_total
+            elif key == "checkInStatus":
+                value = booking.check_in_opens
+            elif isinstance(value, dict):
+                if key == "flightSummary":
                     value = value.get("outbound").get("number")
                 else:
-                    value = next(iter(value.values()))
+                    value = next(iter(value.values()), None)
 
             if isinstance(value, list):
                 value = str(len(value))
 
-            if (
-                value
-                and self.entity_description.device_class == SensorDeviceClass.TIMESTAMP
-            ):
-                user_timezone = dt_util.get_time_zone(self.hass.config.time_zone)
-
-                dt_utc = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").replace(
-                    tzinfo=user_timezone
-                )
-                # Convert the datetime to the default timezone
-                value = dt_utc.astimezone(user_timezone)
-
             self._state = value
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if not self.coordinator.has_changed(
+            *SOURCE_KEYS.get(self.entity_description.key, ()),
+            self.entity_description.key,
+        ):
+            return
+        self.success = bool(self.coordinator.data.get("success"))
+        self.data = self.coordinator.data.get("data")
         self.update_from_coordinator()
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle adding to Home Assistant."""
         await super().async_added_to_hass()
-        await self.async_update()
+        # The shared coordinator already holds fresh data, no need to refetch.
+        self.update_from_coordinator()
 
     async def async_remove(self) -> None:
         """Handle the removal of the entity."""
@@ -289,7 +312,7 @@ class Jet2Sensor(CoordinatorEntity[Jet2Coordinator], SensorEntity):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.success
+        return self.success and self.coordinator.booking_found
 
     @property
     def native_value(self) -> str | date | None:
@@ -300,3 +323,33 @@ class Jet2Sensor(CoordinatorEntity[Jet2Coordinator], SensorEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Define entity attributes."""
         return self.attrs
+
+
+class Jet2ApiHealthSensor(SensorEntity):
+    """Health of the Jet2 API across every booking."""
+
+    entity_description: Jet2ApiHealthSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(self, description: Jet2ApiHealthSensorEntityDescription) -> None:
+        """Initialize."""
+        self.entity_description = description
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "api")},
+            manufacturer="Jet2",
+            model="API",
+            name=f"{DOMAIN.title()} API",
+            configuration_url="https://github.com/jampez77/Jet2/",
+        )
+        self._attr_unique_id = f"{DOMAIN}-api-{description.key}"
+        self.entity_id = f"sensor.{DOMAIN}_api_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the latest totals from the shared request window."""
+        health = async_get_metrics(self.hass).api_health
+        breaker = async_get_circuit_breaker(self.hass)
+        self._attr_native_value = self.entity_description.value_fn(health, breaker)
+        if self.entity_description.attributes_fn is not None:
+            self._attr_extra_state_attributes = self.entity_description.attributes_fn(
+                health, breaker
+            )
@@ -1,27 +1,57 @@
 """Services for Jet2 Integrartion."""
 
+from __future__ import annotations
+
+import asyncio
 import functools
+from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .archive import QUERY_FIELDS, async_get_archive
+from .config_flow import is_date_valid_format
 from .const import (
     CONF_ADD_BOOKING,
+    CONF_ADD_BOOKINGS,
     CONF_BOOKING_REFERENCE,
+    CONF_BOOKING_REFERENCES,
+    CONF_BOOKINGS,
     CONF_CALENDARS,
     CONF_CREATE_CALENDAR,
     CONF_DATE_OF_BIRTH,
+    CONF_DURATION,
+    CONF_END_DATE,
+    CONF_FORMAT,
+    CONF_GET_ARCHIVED_TRIPS,
+    CONF_HOTEL,
+    CONF_INCLUDE_DATA,
+    CONF_LIMIT,
+    CONF_PROFILE,
     CONF_REMOVE_BOOKING,
+    CONF_REMOVE_BOOKINGS,
+    CONF_RESORT,
+    CONF_START_DATE,
     CONF_SURNAME,
     DOMAIN,
 )
-from .coordinator import Jet2Coordinator
+from .coordinator import InvalidAuth, Jet2Error, async_fetch_booking
+from .metrics import async_get_metrics
+from .profiler import FORMAT_STACKS, PROFILE_FORMATS, async_get_profiler
+from .store import async_stash_validated_booking
+
+# Bookings validated against the API at once by the bulk service.
+BULK_CONCURRENCY = 5
 
 # Define the schema for your service
 SERVICE_ADD_BOOKING_SCHEMA = vol.Schema(
@@ -40,33 +70,47 @@ SERVICE_REMOVE_BOOKING_SCHEMA = vol.Schema(
     }
 )
 
+BOOKING_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_BOOKING_REFERENCE): cv.string,
+        vol.Required(CONF_DATE_OF_BIRTH): cv.string,
+        vol.Required(CONF_SURNAME): cv.string,
+    }
+)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Jet2 from a config entry."""
-
-    # Create a coordinator or other necessary components
-    session = async_get_clientsession(hass)
-    coordinator = Jet2Coordinator(hass, session, entry.data)
-
-    # Store the coordinator so it can be accessed by other parts of the integration
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Setup the service (if it hasn't already been set up globally)
-    async_setup_services(hass)
+SERVICE_ADD_BOOKINGS_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Required(CONF_CREATE_CALENDAR): cv.boolean,
+        vol.Required(CONF_BOOKINGS): vol.All(cv.ensure_list, [BOOKING_SCHEMA]),
+    }
+)
 
-    await coordinator.async_refresh()
+SERVICE_GET_ARCHIVED_TRIPS_SCHEMA = vol.Schema(QUERY_FIELDS)
 
-    if coordinator.last_exception is not None:
-        return False
+SERVICE_REMOVE_BOOKINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_BOOKING_REFERENCES): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
 
-    return True
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(CONF_FORMAT, default=FORMAT_STACKS): vol.In(PROFILE_FORMATS),
+    }
+)
 
 
 def async_cleanup_services(hass: HomeAssistant) -> None:
     """Cleanup Jet2 services."""
     hass.services.async_remove(DOMAIN, CONF_ADD_BOOKING)
     hass.services.async_remove(DOMAIN, CONF_REMOVE_BOOKING)
+    hass.services.async_remove(DOMAIN, CONF_ADD_BOOKINGS)
+    hass.services.async_remove(DOMAIN, CONF_REMOVE_BOOKINGS)
+    hass.services.async_remove(DOMAIN, CONF_PROFILE)
 
 
 def async_setup_services(hass: HomeAssistant) -> None:
@@ -76,37 +120,63 @@ def async_setup_services(hass: HomeAssistant) -> None:
             CONF_ADD_BOOKING,
             functools.partial(add_booking, hass),
             SERVICE_ADD_BOOKING_SCHEMA,
+            SupportsResponse.NONE,
         ),
         (
             CONF_REMOVE_BOOKING,
             functools.partial(remove_booking, hass),
             SERVICE_REMOVE_BOOKING_SCHEMA,
+            SupportsResponse.NONE,
+        ),
+        (
+            CONF_ADD_BOOKINGS,
+            functools.partial(add_bookings, hass),
+            SERVICE_ADD_BOOKINGS_SCHEMA,
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            CONF_REMOVE_BOOKINGS,
+            functools.partial(remove_bookings, hass),
+            SERVICE_REMOVE_BOOKINGS_SCHEMA,
+            SupportsResponse.OPTIONAL,
+        ),
+        (
+            CONF_PROFILE,
+            functools.partial(profile, hass),
+            SERVICE_PROFILE_SCHEMA,
+            SupportsResponse.OPTIONAL,
         ),
     ]
-    for name, method, schema in services:
+    for name, method, schema, supports_response in services:
         if hass.services.has_service(DOMAIN, name):
             continue
-        hass.services.async_register(DOMAIN, name, method, schema=schema)
-
+        hass.services.async_register(
+            DOMAIN, name, method, schema=schema, supports_response=supports_response
+        )
 
-async def add_booking(hass: HomeAssistant, call: ServiceCall) -> None:
-    """Add a booking."""
-    booking_reference = call.data.get(CONF_BOOKING_REFERENCE)
-    date_of_birth = call.data.get(CONF_DATE_OF_BIRTH)
-    surname = call.data.get(CONF_SURNAME)
-    create_calendar = call.data.get(CONF_CREATE_CALENDAR)
-    calendars = call.data.get(CONF_ENTITY_ID)
 
+def _calendar_entities(hass: HomeAssistant, call: ServiceCall) -> dict[str, str]:
+    """Return the calendars a service call asked events to be added to."""
     calendar_entities = {}
 
-    if create_calendar:
+    if call.data.get(CONF_CREATE_CALENDAR):
         calendar_entities["None"] = "Create a new calendar"
 
-    for calendar in calendars:
+    for calendar in call.data.get(CONF_ENTITY_ID) or []:
         calendar_entity = hass.states.get(calendar)
         if calendar_entity:
             calendar_entities[calendar] = calendar
 
+    return calendar_entities
+
+
+async def add_booking(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Add a booking."""
+    booking_reference = call.data.get(CONF_BOOKING_REFERENCE)
+    date_of_birth = call.data.get(CONF_DATE_OF_BIRTH)
+    surname = call.data.get(CONF_SURNAME)
+    calendar_entities = _calendar_entities(hass, call)
+
     entries = hass.config_entries.async_entries(DOMAIN)
     if any(
         entry.data.get(CONF_BOOKING_REFERENCE) == booking_reference for entry in entries
@@ -147,3 +217,166 @@ async def remove_booking(hass: HomeAssistant, call: ServiceCall) -> None:
 
     # Remove the config entry
     await hass.config_entries.async_remove(entry.entry_id)
+
+
+async def _async_validate_booking(
+    hass: HomeAssistant, booking: dict[str, str], semaphore: asyncio.Semaphore
+) -> dict[str, Any]:
+    """Check a booking against the API, returning a result row."""
+    booking_reference = booking[CONF_BOOKING_REFERENCE]
+
+    if not is_date_valid_format(booking[CONF_DATE_OF_BIRTH]):
+        return {"status": "invalid_date_format"}
+
+    async with semaphore:
+        try:
+            body = await async_fetch_booking(
+                hass,
+                async_get_clientsession(hass),
+                booking_reference,
+                booking[CONF_DATE_OF_BIRTH],
+                booking[CONF_SURNAME],
+            )
+        except InvalidAuth:
+            return {"status": "invalid_auth"}
+        except (Jet2Error, ValueError) as err:
+            return {"status": "cannot_connect", "error": str(err)}
+
+    if not isinstance(body, dict) or not body.get("success"):
+        return {"status": "invalid_auth"}
+
+    async_stash_validated_booking(hass, booking_reference, body)
+    return {"status": "valid", "body": body}
+
+
+async def add_bookings(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Validate and add many bookings at once."""
+    calendar_entities = _calendar_entities(hass, call)
+    existing = {
+        entry.data.get(CONF_BOOKING_REFERENCE)
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+
+    results: dict[str, dict[str, Any]] = {}
+    to_validate: dict[str, dict[str, str]] = {}
+    for booking in call.data[CONF_BOOKINGS]:
+        booking_reference = booking[CONF_BOOKING_REFERENCE]
+        if booking_reference in existing or booking_reference in to_validate:
+            results[booking_reference] = {"status": "already_exists"}
+        else:
+            to_validate[booking_reference] = booking
+
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+    validated = await asyncio.gather(
+        *(
+            _async_validate_booking(hass, booking, semaphore)
+            for booking in to_validate.values()
+        )
+    )
+
+    valid = []
+    metrics = async_get_metrics(hass)
+    for booking_reference, result in zip(to_validate, validated):
+        if result.pop("body", None) is not None:
+            valid.append(booking_reference)
+        else:
+            # No entry will ever own the metrics of the failed lookup.
+            metrics.forget(booking_reference)
+        results[booking_reference] = result
+
+    flow_results = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": "import"},
+                data={
+                    **to_validate[booking_reference],
+                    CONF_CALENDARS: calendar_entities,
+                },
+            )
+            for booking_reference in valid
+        ),
+        return_exceptions=True,
+    )
+
+    for booking_reference, flow_result in zip(valid, flow_results):
+        if isinstance(flow_result, Exception):
+            results[booking_reference] = {
+                "status": "error",
+                "error": str(flow_result),
+            }
+        elif flow_result.get("type") == "create_entry":
+            results[booking_reference] = {"status": "added"}
+        else:
+            results[booking_reference] = {
+                "status": flow_result.get("reason", "error"),
+            }
+
+    return {"bookings": results}
+
+
+async def remove_bookings(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Remove many bookings at once."""
+    entries = {
+        entry.data.get(CONF_BOOKING_REFERENCE): entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+
+    booking_references = list(dict.fromkeys(call.data[CONF_BOOKING_REFERENCES]))
+    found = [ref for ref in booking_references if ref in entries]
+
+    removed = await asyncio.gather(
+        *(hass.config_entries.async_remove(entries[ref].entry_id) for ref in found),
+        return_exceptions=True,
+    )
+
+    results: dict[str, dict[str, Any]] = {
+        ref: {"status": "not_found"} for ref in booking_references
+    }
+    for ref, result in zip(found, removed):
+        if isinstance(result, Exception):
+            results[ref] = {"status": "error", "error": str(result)}
+        else:
+            results[ref] = {"status": "removed"}
+
+    return {"bookings": results}
+
+
+async def profile(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Profile the integration for a while and write a report."""
+    return await async_get_profiler(hass).async_profile(
+        call.data[CONF_DURATION], call.data[CONF_FORMAT]
+    )
+
+
+def async_setup_archive_services(hass: HomeAssistant) -> None:
+    """Register services that work without any booking configured."""
+    hass.services.async_register(
+        DOMAIN,
+        CONF_GET_ARCHIVED_TRIPS,
+        functools.partial(get_archived_trips, hass),
+        schema=SERVICE_GET_ARCHIVED_TRIPS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def get_archived_trips(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return completed holidays from the archive."""
+    # Travel history is for admins, like the archive websocket commands.
+    # Calls without a user, such as from automations, are allowed.
+    if call.context.user_id:
+        user = await hass.auth.async_get_user(call.context.user_id)
+        if user is None:
+            raise UnknownUser(context=call.context)
+        if not user.is_admin:
+            raise Unauthorized(context=call.context)
+
+    trips = await async_get_archive(hass).async_query(
+        call.data.get(CONF_START_DATE),
+        call.data.get(CONF_END_DATE),
+        call.data.get(CONF_RESORT),
+        call.data.get(CONF_HOTEL),
+        call.data[CONF_LIMIT],
+        call.data[CONF_INCLUDE_DATA],
+    )
+    return {"trips": trips}
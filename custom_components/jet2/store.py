@@ -0,0 +1,100 @@
+"""Persistent snapshots of the last good Jet2 booking responses."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_SNAPSHOT_STORE,
+    DATA_VALIDATED_BOOKINGS,
+    SNAPSHOT_STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+# Coalesce writes from bookings refreshing at around the same time.
+SAVE_DELAY = 30
+
+# How long a response fetched while validating a booking is fresh enough to
+# stand in for the new entry's first refresh.
+VALIDATED_MAX_AGE = 300
+
+
+class Jet2SnapshotStore:
+    """Keep the last successful response of every booking on disk."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, SNAPSHOT_STORAGE_KEY
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load snapshots from disk, only once however often it is called."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the store file."""
+        if (data := await self._store.async_load()) is not None:
+            self._snapshots = data.get("snapshots", {})
+
+    def get(self, entry_id: str) -> dict[str, Any] | None:
+        """Return the snapshot for a config entry."""
+        return self._snapshots.get(entry_id)
+
+    @callback
+    def async_set(self, entry_id: str, body: dict[str, Any]) -> None:
+        """Remember a successful response and schedule a save."""
+        self._snapshots[entry_id] = body
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the snapshot of a removed config entry."""
+        if self._snapshots.pop(entry_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return data to persist."""
+        return {"snapshots": self._snapshots}
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> Jet2SnapshotStore:
+    """Return the loaded domain-wide snapshot store."""
+    if (store := hass.data.get(DATA_SNAPSHOT_STORE)) is None:
+        store = hass.data[DATA_SNAPSHOT_STORE] = Jet2SnapshotStore(hass)
+    await store.async_load()
+    return store
+
+
+@callback
+def async_stash_validated_booking(
+    hass: HomeAssistant, booking_reference: str, body: dict[str, Any]
+) -> None:
+    """Hand a response fetched while validating a booking to its new entry."""
+    validated = hass.data.setdefault(DATA_VALIDATED_BOOKINGS, {})
+    validated[booking_reference] = (time.monotonic(), body)
+
+
+@callback
+def async_pop_validated_booking(
+    hass: HomeAssistant, booking_reference: str
+) -> dict[str, Any] | None:
+    """Return the response fetched while validating a booking, if still fresh."""
+    validated = hass.data.get(DATA_VALIDATED_BOOKINGS, {})
+    if (item := validated.pop(booking_reference, None)) is None:
+        return None
+    fetched, body = item
+    if time.monotonic() - fetched > VALIDATED_MAX_AGE:
+        return None
+    return body
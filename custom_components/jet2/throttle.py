@@ -0,0 +1,191 @@
+"""Domain-wide throttling of Jet2 API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_CIRCUIT_BREAKER, DATA_RATE_LIMITER, DATA_SINGLE_FLIGHT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sustained requests per second across every booking, and the burst allowed
+# on top of that after a quiet period.
+RATE_LIMIT = 0.5
+RATE_LIMIT_BURST = 5
+
+# Consecutive failed requests, from any booking, before all polling pauses.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 300
+
+
+class TokenBucket:
+    """Token bucket limiter, waiters are served in arrival order."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last call."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be made."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class CircuitBreaker:
+    """Pause every Jet2 request while the API is clearly down.
+
+    Opens after a run of failures or when the API asks us to back off.
+    Once the pause is over a single probe request is let through; its
+    outcome closes the breaker or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def failures(self) -> int:
+        """Return the number of failed requests in a row."""
+        return self._failures
+
+    @property
+    def probing(self) -> bool:
+        """Return True while a probe request is in flight."""
+        return self._probing
+
+    @property
+    def state(self) -> str:
+        """Return ok, retrying, paused or probing."""
+        if self.remaining > 0:
+            return "paused"
+        if self._failures >= self.failure_threshold:
+            return "probing"
+        if self._failures:
+            return "retrying"
+        return "ok"
+
+    @property
+    def remaining(self) -> float:
+        """Return the seconds until requests are allowed again."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be made now."""
+        if self.remaining > 0:
+            return False
+        if self._failures >= self.failure_threshold:
+            # Half open: let one probe through at a time.
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """Let another probe through, the last one ended without an outcome."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self._failures >= self.failure_threshold:
+            _LOGGER.info("Jet2 API is reachable again, resuming requests")
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker if needed."""
+        self._failures += 1
+        if self._probing or self._failures == self.failure_threshold:
+            _LOGGER.warning(
+                "Jet2 API failed %s times in a row, pausing requests for %ss",
+                self._failures,
+                self.reset_timeout,
+            )
+            self.pause(self.reset_timeout)
+        self._probing = False
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for at least the given time."""
+        self._open_until = max(self._open_until, time.monotonic() + seconds)
+
+
+class SingleFlight:
+    """Share one in-flight call between every caller asking the same thing."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return True if a call for key is running."""
+        return key in self._inflight
+
+    async def async_run(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await the call in flight for key, starting it if there is none."""
+        if (task := self._inflight.get(key)) is None:
+            task = self.hass.async_create_task(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._async_done(key, done))
+        # One caller giving up must not cancel the call for everyone else.
+        return await asyncio.shield(task)
+
+    def _async_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished call."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the error retrieved in case every caller went away.
+            task.exception()
+
+
+def async_get_rate_limiter(hass: HomeAssistant) -> TokenBucket:
+    """Return the limiter shared by every Jet2 request."""
+    if (limiter := hass.data.get(DATA_RATE_LIMITER)) is None:
+        limiter = hass.data[DATA_RATE_LIMITER] = TokenBucket(
+            RATE_LIMIT, RATE_LIMIT_BURST
+        )
+    return limiter
+
+
+def async_get_circuit_breaker(hass: HomeAssistant) -> CircuitBreaker:
+    """Return the circuit breaker shared by every Jet2 request."""
+    if (breaker := hass.data.get(DATA_CIRCUIT_BREAKER)) is None:
+        breaker = hass.data[DATA_CIRCUIT_BREAKER] = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+        )
+    return breaker
+
+
+def async_get_single_flight(hass: HomeAssistant) -> SingleFlight:
+    """Return the request coalescer shared by every Jet2 request."""
+    if (single_flight := hass.data.get(DATA_SINGLE_FLIGHT)) is None:
+        single_flight = hass.data[DATA_SINGLE_FLIGHT] = SingleFlight(hass)
+    return single_flight
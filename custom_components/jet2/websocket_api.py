@@ -0,0 +1,82 @@
+"""Websocket commands for the Jet2 integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+
+from .archive import QUERY_FIELDS, async_get_archive
+from .const import (
+    CONF_END_DATE,
+    CONF_HOTEL,
+    CONF_INCLUDE_DATA,
+    CONF_LIMIT,
+    CONF_RESORT,
+    CONF_START_DATE,
+    DOMAIN,
+)
+from .diagnostics import entry_metrics
+from .metrics import shared_metrics
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Jet2 websocket commands."""
+    websocket_api.async_register_command(hass, websocket_archived_trips)
+    websocket_api.async_register_command(hass, websocket_metrics)
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/archive/trips", **QUERY_FIELDS}
+)
+@websocket_api.async_response
+async def websocket_archived_trips(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return archived trips."""
+    trips = await async_get_archive(hass).async_query(
+        msg.get(CONF_START_DATE),
+        msg.get(CONF_END_DATE),
+        msg.get(CONF_RESORT),
+        msg.get(CONF_HOTEL),
+        msg[CONF_LIMIT],
+        msg[CONF_INCLUDE_DATA],
+    )
+    connection.send_result(msg["id"], {"trips": trips})
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/metrics", vol.Optional("entry_id"): str}
+)
+@callback
+def websocket_metrics(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return request, cache and entity metrics of every loaded booking."""
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+        and msg.get("entry_id") in (None, entry.entry_id)
+    ]
+    connection.send_result(
+        msg["id"],
+        {
+            "entries": {
+                entry.entry_id: {"title": entry.title, **entry_metrics(hass, entry)}
+                for entry in entries
+            },
+            **shared_metrics(hass),
+        },
+    )